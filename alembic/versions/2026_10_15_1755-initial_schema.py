@@ -0,0 +1,219 @@
+"""initial schema
+
+Revision ID: 1e6a9c4f7b20
+Revises:
+Create Date: 2026-10-15 17:55:00.000000
+
+The schema as Base.metadata.create_all built it before migrations were
+introduced. Databases created that way already have it; mark them with
+`alembic stamp 1e6a9c4f7b20` before running `alembic upgrade head`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1e6a9c4f7b20'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_table(
+        'contact_inquiries',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('full_name', sa.String(length=255), nullable=False),
+        sa.Column('company_name', sa.String(length=255), nullable=True),
+        sa.Column('phone', sa.String(length=50), nullable=True),
+        sa.Column('inquiry_type', sa.String(length=50), nullable=True),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('annual_revenue', sa.String(length=100), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('assigned_to', sa.String(length=255), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('responded_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_contact_inquiries_email', 'contact_inquiries', ['email'], unique=False)
+    op.create_index('ix_contact_inquiries_id', 'contact_inquiries', ['id'], unique=False)
+
+    op.create_table(
+        'demo_access',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('full_name', sa.String(length=255), nullable=True),
+        sa.Column('company_name', sa.String(length=255), nullable=True),
+        sa.Column('job_title', sa.String(length=255), nullable=True),
+        sa.Column('phone', sa.String(length=50), nullable=True),
+        sa.Column('company_size', sa.String(length=50), nullable=True),
+        sa.Column('annual_revenue', sa.String(length=100), nullable=True),
+        sa.Column('current_erp', sa.String(length=100), nullable=True),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('access_token', sa.String(length=255), nullable=False),
+        sa.Column('demo_viewed', sa.Boolean(), nullable=True),
+        sa.Column('demo_viewed_at', sa.DateTime(), nullable=True),
+        sa.Column('demo_view_count', sa.String(length=10), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.Column('marketing_consent', sa.Boolean(), nullable=True),
+        sa.Column('utm_source', sa.String(length=100), nullable=True),
+        sa.Column('utm_medium', sa.String(length=100), nullable=True),
+        sa.Column('utm_campaign', sa.String(length=100), nullable=True),
+        sa.Column('referrer', sa.String(length=500), nullable=True),
+        sa.Column('converted_to_trial', sa.Boolean(), nullable=True),
+        sa.Column('converted_at', sa.DateTime(), nullable=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_demo_access_access_token', 'demo_access', ['access_token'], unique=True)
+    op.create_index('ix_demo_access_email', 'demo_access', ['email'], unique=True)
+    op.create_index('ix_demo_access_id', 'demo_access', ['id'], unique=False)
+
+    op.create_table(
+        'organisations',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('slug', sa.String(length=100), nullable=False),
+        sa.Column('company_registration', sa.String(length=50), nullable=True),
+        sa.Column('industry', sa.String(length=100), nullable=True),
+        sa.Column('size', sa.String(length=50), nullable=True),
+        sa.Column('website', sa.String(length=255), nullable=True),
+        sa.Column('billing_email', sa.String(length=255), nullable=True),
+        sa.Column('billing_address', sa.Text(), nullable=True),
+        sa.Column('subscription_tier', sa.String(length=50), nullable=False),
+        sa.Column('subscription_status', sa.String(length=50), nullable=False),
+        sa.Column('trial_ends_at', sa.DateTime(), nullable=True),
+        sa.Column('stripe_customer_id', sa.String(length=255), nullable=True),
+        sa.Column('stripe_subscription_id', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('stripe_customer_id'),
+    )
+    op.create_index('ix_organisations_id', 'organisations', ['id'], unique=False)
+    op.create_index('ix_organisations_slug', 'organisations', ['slug'], unique=True)
+
+    op.create_table(
+        'users',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('hashed_password', sa.String(length=255), nullable=False),
+        sa.Column('full_name', sa.String(length=255), nullable=True),
+        sa.Column('job_title', sa.String(length=255), nullable=True),
+        sa.Column('phone', sa.String(length=50), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_verified', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('last_login_at', sa.DateTime(), nullable=True),
+        sa.Column('password_reset_token', sa.String(length=255), nullable=True),
+        sa.Column('password_reset_expires', sa.DateTime(), nullable=True),
+        sa.Column('verification_token', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+
+    op.create_table(
+        'data_sources',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('organisation_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column(
+            'source_type',
+            sa.Enum('CSV', 'XERO', 'NETSUITE', 'QUICKBOOKS', 'SAGE', 'API', name='datasourcetype'),
+            nullable=False,
+        ),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('connection_config', sa.JSON(), nullable=True),
+        sa.Column(
+            'status',
+            sa.Enum('PENDING', 'CONNECTED', 'ERROR', 'DISCONNECTED', name='connectionstatus'),
+            nullable=True,
+        ),
+        sa.Column('last_sync_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('records_synced', sa.Integer(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['organisation_id'], ['organisations.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_data_sources_id', 'data_sources', ['id'], unique=False)
+
+    op.create_table(
+        'organisation_members',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('organisation_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('role', sa.String(length=50), nullable=False),
+        sa.Column('invited_by_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('invitation_token', sa.String(length=255), nullable=True),
+        sa.Column('invitation_accepted_at', sa.DateTime(), nullable=True),
+        sa.Column('joined_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['invited_by_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['organisation_id'], ['organisations.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_organisation_members_id', 'organisation_members', ['id'], unique=False)
+    op.create_index('ix_organisation_members_organisation_id', 'organisation_members', ['organisation_id'], unique=False)
+    op.create_index('ix_organisation_members_user_id', 'organisation_members', ['user_id'], unique=False)
+
+    op.create_table(
+        'financial_records',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('data_source_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('organisation_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('external_id', sa.String(length=255), nullable=True),
+        sa.Column('record_type', sa.String(length=50), nullable=False),
+        sa.Column('record_date', sa.DateTime(), nullable=False),
+        sa.Column('period_year', sa.Integer(), nullable=False),
+        sa.Column('period_month', sa.Integer(), nullable=False),
+        sa.Column('account_code', sa.String(length=50), nullable=False),
+        sa.Column('account_name', sa.String(length=255), nullable=True),
+        sa.Column('account_category', sa.String(length=100), nullable=True),
+        sa.Column('department_code', sa.String(length=50), nullable=True),
+        sa.Column('department_name', sa.String(length=255), nullable=True),
+        sa.Column('amount_actual', sa.Numeric(precision=15, scale=2), nullable=True),
+        sa.Column('amount_budget', sa.Numeric(precision=15, scale=2), nullable=True),
+        sa.Column('amount_forecast', sa.Numeric(precision=15, scale=2), nullable=True),
+        sa.Column('amount_prior_year', sa.Numeric(precision=15, scale=2), nullable=True),
+        sa.Column('currency', sa.String(length=3), nullable=True),
+        sa.Column('exchange_rate', sa.Numeric(precision=10, scale=6), nullable=True),
+        sa.Column('project_code', sa.String(length=50), nullable=True),
+        sa.Column('customer_code', sa.String(length=50), nullable=True),
+        sa.Column('vendor_code', sa.String(length=50), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('source_reference', sa.String(length=255), nullable=True),
+        sa.Column('extra_data', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['data_source_id'], ['data_sources.id']),
+        sa.ForeignKeyConstraint(['organisation_id'], ['organisations.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_financial_records_id', 'financial_records', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_table('financial_records')
+    op.drop_table('organisation_members')
+    op.drop_table('data_sources')
+    op.drop_table('users')
+    op.drop_table('organisations')
+    op.drop_table('demo_access')
+    op.drop_table('contact_inquiries')
+    sa.Enum(name='connectionstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='datasourcetype').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,33 @@
+"""financial_records org/date/account index
+
+Revision ID: 3f1c2a9d8b41
+Revises: 1e6a9c4f7b20
+Create Date: 2026-10-15 18:00:00.000000
+
+Adds what the create_all schema (see 1e6a9c4f7b20) lacks.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d8b41'
+down_revision: Union[str, None] = '1e6a9c4f7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_index(
+        'ix_financial_records_org_date_account',
+        'financial_records',
+        ['organisation_id', 'record_date', 'account_code'],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index('ix_financial_records_org_date_account', table_name='financial_records')
@@ -0,0 +1,39 @@
+"""data source foreign key indexes
+
+Revision ID: 8a7e51c0d2f3
+Revises: 3f1c2a9d8b41
+Create Date: 2026-10-15 18:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a7e51c0d2f3'
+down_revision: Union[str, None] = '3f1c2a9d8b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_index(
+        'ix_data_sources_organisation_id',
+        'data_sources',
+        ['organisation_id'],
+        if_not_exists=True,
+    )
+    op.create_index(
+        'ix_financial_records_data_source_id',
+        'financial_records',
+        ['data_source_id'],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index('ix_financial_records_data_source_id', table_name='financial_records')
+    op.drop_index('ix_data_sources_organisation_id', table_name='data_sources')
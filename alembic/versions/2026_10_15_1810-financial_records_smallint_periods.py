@@ -0,0 +1,43 @@
+"""financial_records smallint periods
+
+Revision ID: c4d9e2b7a610
+Revises: 8a7e51c0d2f3
+Create Date: 2026-10-15 18:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d9e2b7a610'
+down_revision: Union[str, None] = '8a7e51c0d2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    for column in ('period_year', 'period_month'):
+        op.alter_column(
+            'financial_records',
+            column,
+            type_=sa.SmallInteger(),
+            existing_type=sa.Integer(),
+            existing_nullable=False,
+            postgresql_using=f'{column}::smallint',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    for column in ('period_year', 'period_month'):
+        op.alter_column(
+            'financial_records',
+            column,
+            type_=sa.Integer(),
+            existing_type=sa.SmallInteger(),
+            existing_nullable=False,
+        )
@@ -0,0 +1,95 @@
+"""partition financial_records by record_date
+
+Revision ID: 5b0f7d3e9c28
+Revises: c4d9e2b7a610
+Create Date: 2026-10-15 18:15:00.000000
+
+Rebuilds financial_records as a RANGE (record_date) partitioned table with
+one partition per year plus a DEFAULT partition, and copies existing rows
+across. Add the next year's partition with a new revision before it starts;
+until then its rows go to financial_records_default.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b0f7d3e9c28'
+down_revision: Union[str, None] = 'c4d9e2b7a610'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Yearly partitions created up front: financial_records_y2020 .. _y2027
+FIRST_YEAR = 2020
+LAST_YEAR = 2027
+
+INDEXES = (
+    ('ix_financial_records_id', ['id']),
+    ('ix_financial_records_data_source_id', ['data_source_id']),
+    ('ix_financial_records_org_date_account', ['organisation_id', 'record_date', 'account_code']),
+)
+
+
+def _swap_out_old_table() -> None:
+    """Rename financial_records aside, freeing its index and key names."""
+    op.rename_table('financial_records', 'financial_records_old')
+    op.execute(
+        'ALTER TABLE financial_records_old '
+        'RENAME CONSTRAINT financial_records_pkey TO financial_records_old_pkey'
+    )
+    for name, _ in INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def _add_keys_and_indexes(primary_key: str) -> None:
+    """Primary key, foreign keys and indexes for the new financial_records."""
+    op.execute(f'ALTER TABLE financial_records ADD PRIMARY KEY ({primary_key})')
+    op.create_foreign_key(
+        'financial_records_data_source_id_fkey', 'financial_records',
+        'data_sources', ['data_source_id'], ['id'],
+    )
+    op.create_foreign_key(
+        'financial_records_organisation_id_fkey', 'financial_records',
+        'organisations', ['organisation_id'], ['id'],
+    )
+    for name, columns in INDEXES:
+        op.create_index(name, 'financial_records', columns)
+
+
+def _copy_rows_and_drop_old_table() -> None:
+    op.execute('INSERT INTO financial_records SELECT * FROM financial_records_old')
+    op.drop_table('financial_records_old')
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    _swap_out_old_table()
+
+    op.execute(
+        'CREATE TABLE financial_records '
+        '(LIKE financial_records_old INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE (record_date)'
+    )
+    for year in range(FIRST_YEAR, LAST_YEAR + 1):
+        op.execute(
+            f'CREATE TABLE financial_records_y{year} PARTITION OF financial_records '
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        )
+    op.execute('CREATE TABLE financial_records_default PARTITION OF financial_records DEFAULT')
+
+    _add_keys_and_indexes('id, record_date')
+    _copy_rows_and_drop_old_table()
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    _swap_out_old_table()
+
+    op.execute(
+        'CREATE TABLE financial_records '
+        '(LIKE financial_records_old INCLUDING DEFAULTS)'
+    )
+
+    _add_keys_and_indexes('id')
+    _copy_rows_and_drop_old_table()
@@ -0,0 +1,42 @@
+"""demo_view_count integer
+
+Revision ID: e91b4f6a0c57
+Revises: 5b0f7d3e9c28
+Create Date: 2026-10-15 18:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91b4f6a0c57'
+down_revision: Union[str, None] = '5b0f7d3e9c28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.execute("UPDATE demo_access SET demo_view_count = '0' WHERE demo_view_count IS NULL")
+    op.alter_column(
+        'demo_access',
+        'demo_view_count',
+        type_=sa.Integer(),
+        existing_type=sa.String(length=10),
+        nullable=False,
+        postgresql_using='demo_view_count::integer',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.alter_column(
+        'demo_access',
+        'demo_view_count',
+        type_=sa.String(length=10),
+        existing_type=sa.Integer(),
+        nullable=True,
+    )
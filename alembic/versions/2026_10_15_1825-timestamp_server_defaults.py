@@ -0,0 +1,46 @@
+"""timestamp server defaults
+
+Revision ID: 7d2a8c5f1e93
+Revises: e91b4f6a0c57
+Create Date: 2026-10-15 18:25:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a8c5f1e93'
+down_revision: Union[str, None] = 'e91b4f6a0c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('data_sources', 'financial_records', 'demo_access', 'contact_inquiries')
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    for table in TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(
+                table,
+                column,
+                server_default=sa.func.now(),
+                existing_type=sa.DateTime(),
+                existing_nullable=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    for table in TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(
+                table,
+                column,
+                server_default=None,
+                existing_type=sa.DateTime(),
+                existing_nullable=True,
+            )
@@ -0,0 +1,39 @@
+"""demo_access token hash
+
+Revision ID: a36f0b9d4e12
+Revises: 7d2a8c5f1e93
+Create Date: 2026-10-15 18:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a36f0b9d4e12'
+down_revision: Union[str, None] = '7d2a8c5f1e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match DemoAccess.access_token_hash / DemoAccess.token_lookup()
+TOKEN_HASH = "('x' || substr(md5(access_token), 1, 16))::bit(64)::bigint"
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    # Generated column: existing rows are hashed as part of the ADD COLUMN
+    op.add_column(
+        'demo_access',
+        sa.Column('access_token_hash', sa.BigInteger(), sa.Computed(TOKEN_HASH, persisted=True)),
+    )
+    op.create_index('ix_demo_access_access_token_hash', 'demo_access', ['access_token_hash'], unique=True)
+    op.drop_index('ix_demo_access_access_token', table_name='demo_access')
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.create_index('ix_demo_access_access_token', 'demo_access', ['access_token'], unique=True)
+    op.drop_index('ix_demo_access_access_token_hash', table_name='demo_access')
+    op.drop_column('demo_access', 'access_token_hash')
@@ -0,0 +1,45 @@
+"""case-insensitive email indexes
+
+Revision ID: f28c6e1a9b74
+Revises: a36f0b9d4e12
+Create Date: 2026-10-15 18:35:00.000000
+
+Fails if demo_access already holds addresses that differ only by case;
+merge those rows before upgrading.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f28c6e1a9b74'
+down_revision: Union[str, None] = 'a36f0b9d4e12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_index(
+        'ix_demo_access_email_lower',
+        'demo_access',
+        [sa.text('lower(email)')],
+        unique=True,
+    )
+    op.drop_index('ix_demo_access_email', table_name='demo_access')
+    op.create_index(
+        'ix_contact_inquiries_email_lower',
+        'contact_inquiries',
+        [sa.text('lower(email)')],
+    )
+    op.drop_index('ix_contact_inquiries_email', table_name='contact_inquiries')
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.create_index('ix_contact_inquiries_email', 'contact_inquiries', ['email'])
+    op.drop_index('ix_contact_inquiries_email_lower', table_name='contact_inquiries')
+    op.create_index('ix_demo_access_email', 'demo_access', ['email'], unique=True)
+    op.drop_index('ix_demo_access_email_lower', table_name='demo_access')
@@ -0,0 +1,55 @@
+"""organisation_members user/org index
+
+Revision ID: 0b5e3d7c9a16
+Revises: f28c6e1a9b74
+Create Date: 2026-10-15 18:40:00.000000
+
+Built CONCURRENTLY so membership reads and writes are not blocked.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b5e3d7c9a16'
+down_revision: Union[str, None] = 'f28c6e1a9b74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_org_members_user_org',
+            'organisation_members',
+            ['user_id', 'organisation_id', 'role'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # The composite index's leading column covers lookups by user_id
+        op.drop_index(
+            'ix_organisation_members_user_id',
+            table_name='organisation_members',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_organisation_members_user_id',
+            'organisation_members',
+            ['user_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_org_members_user_org',
+            table_name='organisation_members',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,67 @@
+"""fixed-width password hash and uuid tokens
+
+Revision ID: 6e4b1f8a2c35
+Revises: 0b5e3d7c9a16
+Create Date: 2026-10-15 18:45:00.000000
+
+Fails if a stored token isn't a UUID string or a password hash is longer
+than 60 characters (i.e. not bcrypt).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e4b1f8a2c35'
+down_revision: Union[str, None] = '0b5e3d7c9a16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TOKEN_COLUMNS = (
+    ('users', 'password_reset_token'),
+    ('users', 'verification_token'),
+    ('organisation_members', 'invitation_token'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.alter_column(
+        'users',
+        'hashed_password',
+        type_=sa.String(length=60),
+        existing_type=sa.String(length=255),
+        existing_nullable=False,
+    )
+    for table, column in TOKEN_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.UUID(as_uuid=True),
+            existing_type=sa.String(length=255),
+            existing_nullable=True,
+            postgresql_using=f'{column}::uuid',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    for table, column in TOKEN_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(length=255),
+            existing_type=postgresql.UUID(as_uuid=True),
+            existing_nullable=True,
+            postgresql_using=f'{column}::text',
+        )
+    op.alter_column(
+        'users',
+        'hashed_password',
+        type_=sa.String(length=255),
+        existing_type=sa.String(length=60),
+        existing_nullable=False,
+    )
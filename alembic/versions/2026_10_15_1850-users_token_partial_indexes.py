@@ -0,0 +1,47 @@
+"""users token partial indexes
+
+Revision ID: d7a3c9e5b182
+Revises: 6e4b1f8a2c35
+Create Date: 2026-10-15 18:50:00.000000
+
+Built CONCURRENTLY so logins and signups are not blocked.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3c9e5b182'
+down_revision: Union[str, None] = '6e4b1f8a2c35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TOKEN_COLUMNS = ('password_reset_token', 'verification_token')
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    with op.get_context().autocommit_block():
+        for column in TOKEN_COLUMNS:
+            op.create_index(
+                f'ix_users_{column}',
+                'users',
+                [column],
+                postgresql_where=sa.text(f'{column} IS NOT NULL'),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    with op.get_context().autocommit_block():
+        for column in TOKEN_COLUMNS:
+            op.drop_index(
+                f'ix_users_{column}',
+                table_name='users',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
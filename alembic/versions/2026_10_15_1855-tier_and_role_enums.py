@@ -0,0 +1,63 @@
+"""subscription tier and member role enums
+
+Revision ID: 2c8f5a1d7e49
+Revises: d7a3c9e5b182
+Create Date: 2026-10-15 18:55:00.000000
+
+Fails if an existing row holds a value outside the enum; fix those rows
+before upgrading.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c8f5a1d7e49'
+down_revision: Union[str, None] = 'd7a3c9e5b182'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, enum type); labels must match app/models/organisation.py
+ENUM_COLUMNS = (
+    (
+        'organisations',
+        'subscription_tier',
+        postgresql.ENUM('trial', 'essentials', 'professional', 'enterprise', name='subscription_tier'),
+    ),
+    (
+        'organisation_members',
+        'role',
+        postgresql.ENUM('owner', 'admin', 'member', 'viewer', name='member_role'),
+    ),
+)
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    for table, column, enum_type in ENUM_COLUMNS:
+        enum_type.create(op.get_bind())
+        op.alter_column(
+            table,
+            column,
+            type_=enum_type,
+            existing_type=sa.String(length=50),
+            existing_nullable=False,
+            postgresql_using=f'{column}::{enum_type.name}',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    for table, column, enum_type in ENUM_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(length=50),
+            existing_type=enum_type,
+            existing_nullable=False,
+            postgresql_using=f'{column}::text',
+        )
+        enum_type.drop(op.get_bind())
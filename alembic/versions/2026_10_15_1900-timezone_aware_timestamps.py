@@ -0,0 +1,81 @@
+"""timezone-aware timestamps for users, organisations and demo tables
+
+Revision ID: 9f1d6b3e8a27
+Revises: 2c8f5a1d7e49
+Create Date: 2026-10-15 19:00:00.000000
+
+Existing naive values were written as UTC and are converted as such.
+Rewrites the affected tables; run outside peak hours.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f1d6b3e8a27'
+down_revision: Union[str, None] = '2c8f5a1d7e49'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMESTAMP_COLUMNS = {
+    'users': ('created_at', 'updated_at', 'last_login_at', 'password_reset_expires'),
+    'organisations': ('trial_ends_at', 'created_at', 'updated_at'),
+    'organisation_members': ('invitation_accepted_at', 'joined_at'),
+    'demo_access': ('demo_viewed_at', 'expires_at', 'converted_at', 'created_at', 'updated_at'),
+    'contact_inquiries': ('responded_at', 'created_at', 'updated_at'),
+}
+
+# Columns whose Python-side utcnow default moves to the database
+SERVER_DEFAULT_COLUMNS = {
+    'users': ('created_at', 'updated_at'),
+    'organisations': ('created_at', 'updated_at'),
+    'organisation_members': ('joined_at',),
+}
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.DateTime(timezone=True),
+                existing_type=sa.DateTime(),
+                existing_nullable=True,
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
+    for table, columns in SERVER_DEFAULT_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                server_default=sa.func.now(),
+                existing_type=sa.DateTime(timezone=True),
+                existing_nullable=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    for table, columns in SERVER_DEFAULT_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                server_default=None,
+                existing_type=sa.DateTime(timezone=True),
+                existing_nullable=True,
+            )
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.DateTime(),
+                existing_type=sa.DateTime(timezone=True),
+                existing_nullable=True,
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
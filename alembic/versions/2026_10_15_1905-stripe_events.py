@@ -0,0 +1,46 @@
+"""stripe_events table for webhook delivery
+
+Revision ID: 4b8e2f6c1d93
+Revises: 9f1d6b3e8a27
+Create Date: 2026-10-15 19:05:00.000000
+
+Webhook events are recorded here before they are acknowledged; the event id
+primary key dedupes Stripe's redeliveries.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8e2f6c1d93'
+down_revision: Union[str, None] = '9f1d6b3e8a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_table(
+        'stripe_events',
+        sa.Column('event_id', sa.String(length=255), nullable=False),
+        sa.Column('type', sa.String(length=100), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('received_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('event_id'),
+    )
+    op.create_index(
+        'ix_stripe_events_pending',
+        'stripe_events',
+        ['received_at'],
+        postgresql_where=sa.text('processed_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index('ix_stripe_events_pending', table_name='stripe_events')
+    op.drop_table('stripe_events')
@@ -0,0 +1,42 @@
+"""stripe_events retry bookkeeping and ordering
+
+Revision ID: 7c3a5e9b2d14
+Revises: 4b8e2f6c1d93
+Create Date: 2026-10-15 19:10:00.000000
+
+Adds attempts/last_error so failing events stop being retried, and the
+subscription id and Stripe creation time used to skip superseded events.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3a5e9b2d14'
+down_revision: Union[str, None] = '4b8e2f6c1d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.add_column('stripe_events', sa.Column('subscription_id', sa.String(length=255), nullable=True))
+    op.add_column('stripe_events', sa.Column('event_created_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('stripe_events', sa.Column('attempts', sa.SmallInteger(), server_default='0', nullable=False))
+    op.add_column('stripe_events', sa.Column('last_error', sa.Text(), nullable=True))
+    op.create_index(
+        'ix_stripe_events_subscription',
+        'stripe_events',
+        ['subscription_id', 'event_created_at'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index('ix_stripe_events_subscription', table_name='stripe_events')
+    op.drop_column('stripe_events', 'last_error')
+    op.drop_column('stripe_events', 'attempts')
+    op.drop_column('stripe_events', 'event_created_at')
+    op.drop_column('stripe_events', 'subscription_id')
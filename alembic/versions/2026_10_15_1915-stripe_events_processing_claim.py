@@ -0,0 +1,33 @@
+"""stripe_events processing claim
+
+Revision ID: e5d1b7f3a968
+Revises: 7c3a5e9b2d14
+Create Date: 2026-10-15 19:15:00.000000
+
+processing_started_at marks an event as being applied, so concurrent
+deliveries and retries don't apply it twice.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5d1b7f3a968'
+down_revision: Union[str, None] = '7c3a5e9b2d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.add_column(
+        'stripe_events',
+        sa.Column('processing_started_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_column('stripe_events', 'processing_started_at')
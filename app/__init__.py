@@ -15,6 +15,13 @@ Email: hello@finsightai.tech
 Copyright (c) 2025 FinSight AI Limited
 """
 
+import os
+
+# Skip pydantic's self-validation of generated core schemas at import time.
+# Production images bake this in (see Dockerfile); set it here too so local
+# runs get the same cold-start behaviour.
+os.environ.setdefault("PYDANTIC_SKIP_VALIDATING_CORE_SCHEMAS", "true")
+
 __version__ = "1.0.0"
 __author__ = "Aaron Melvin"
 __email__ = "hello@finsightai.tech"
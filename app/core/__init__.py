@@ -1,33 +1,42 @@
 # ============================================
 # FINSIGHT AI - CORE MODULE
 # ============================================
+#
+# Names are imported on first attribute access (PEP 562), so importing
+# app.core.config does not build settings or the database engine.
 
-from app.core.config import settings, get_settings
-from app.core.database import get_db, engine, Base, AsyncSessionLocal
-from app.core.security import (
-    get_password_hash,
-    verify_password,
-    create_access_token,
-    create_refresh_token,
-    decode_token,
-    get_current_user,
-    get_current_active_user,
-    require_subscription_tier,
-)
+import importlib
 
-__all__ = [
-    "settings",
-    "get_settings",
-    "get_db",
-    "engine",
-    "Base",
-    "AsyncSessionLocal",
-    "get_password_hash",
-    "verify_password",
-    "create_access_token",
-    "create_refresh_token",
-    "decode_token",
-    "get_current_user",
-    "get_current_active_user",
-    "require_subscription_tier",
-]
+# Exported name -> module that defines it
+_EXPORTS = {
+    "settings": "app.core.config",
+    "get_settings": "app.core.config",
+    "get_db": "app.core.database",
+    "engine": "app.core.database",
+    "Base": "app.core.database",
+    "AsyncSessionLocal": "app.core.database",
+    "get_password_hash": "app.core.security",
+    "verify_password": "app.core.security",
+    "get_password_hash_async": "app.core.security",
+    "verify_password_async": "app.core.security",
+    "user_token_claims": "app.core.security",
+    "create_access_token": "app.core.security",
+    "create_refresh_token": "app.core.security",
+    "decode_token": "app.core.security",
+    "get_current_user": "app.core.security",
+    "get_current_user_profile": "app.core.security",
+    "get_current_active_user": "app.core.security",
+    "require_subscription_tier": "app.core.security",
+    "get_user_organisation_tier": "app.core.security",
+    "clear_tier_cache": "app.core.security",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
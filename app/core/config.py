@@ -1,24 +1,21 @@
 """
 FinSight AI - Configuration Settings
 ====================================
-Environment-based configuration using Pydantic Settings.
+Environment-based configuration loaded from os.environ (and .env).
 """
 
-from pydantic_settings import BaseSettings
+from dataclasses import MISSING, dataclass, fields
 from typing import Optional
 from functools import lru_cache
+import os
 import sys
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
-class Settings(BaseSettings):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Settings:
     """Application settings loaded from environment variables."""
 
     # Application
@@ -28,6 +25,16 @@ class Settings(BaseSettings):
 
     # Database (Neon PostgreSQL)
     DATABASE_URL: str  # Required - your Neon connection string
+    SERVERLESS: bool = False  # True for per-request runtimes: use NullPool + Neon's -pooler host
+    RUN_CREATE_ALL: bool = False  # Development only: create missing tables on startup
+    # Connection pool per worker; keep (size + overflow) x workers x instances
+    # below the database's max_connections
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    # Ping each connection on checkout (one extra round trip per request).
+    # Safe to turn off when pool_recycle already retires connections before
+    # the server or a proxy drops them.
+    DB_POOL_PRE_PING: bool = True
 
     # JWT Authentication
     SECRET_KEY: str  # Required - generate with: openssl rand -hex 32
@@ -63,23 +70,68 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     AWS_S3_BUCKET: Optional[str] = None
     AWS_REGION: str = "eu-west-2"  # London
-    
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
+
+
+def _bool(value: str) -> bool:
+    """Parse a boolean environment value (true/false, 1/0, yes/no, on/off)."""
+    normalised = value.strip().lower()
+    if normalised in ("1", "true", "t", "yes", "y", "on"):
+        return True
+    if normalised in ("0", "false", "f", "no", "n", "off"):
+        return False
+    raise ValueError(f"invalid boolean value: {value!r}")
+
+
+def _int(value: str) -> int:
+    """Parse an integer environment value."""
+    return int(value.strip())
+
+
+# Field type -> parser for environment strings (plain str fields are used as-is)
+_PARSERS = {
+    bool: _bool,
+    int: _int,
+    Optional[int]: _int,
+}
+
+
+def _load_settings() -> Settings:
+    """Build Settings from os.environ, loading .env first if present."""
+    from dotenv import load_dotenv
+
+    load_dotenv(".env", encoding="utf-8")
+
+    values = {}
+    missing = []
+    for field in fields(Settings):
+        raw = os.environ.get(field.name)
+        if raw is None:
+            if field.default is MISSING:
+                missing.append(field.name)
+            continue
+        parser = _PARSERS.get(field.type)
+        try:
+            values[field.name] = parser(raw) if parser else raw
+        except ValueError as e:
+            raise RuntimeError(f"Invalid value for {field.name}: {e}") from None
+
+    if missing:
+        raise RuntimeError(
+            f"Missing required environment variables: {', '.join(missing)}"
+        )
+
+    return Settings(**values)
 
 
 @lru_cache()
 def get_settings() -> Settings:
     """Get cached settings instance with validation."""
     try:
-        logger.info("Loading application settings...")
-        settings = Settings()
-        logger.info(f"✓ Settings loaded successfully")
-        logger.info(f"  - Environment: {settings.ENVIRONMENT}")
-        logger.info(f"  - Database URL: {'*' * 20}...{settings.DATABASE_URL[-20:] if len(settings.DATABASE_URL) > 20 else '***'}")
-        logger.info(f"  - Secret Key: {'*' * 10}... (hidden)")
+        settings = _load_settings()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("✓ Settings loaded successfully")
+            logger.debug(f"  - Environment: {settings.ENVIRONMENT}")
+            logger.debug(f"  - Database URL: {'*' * 20}...{settings.DATABASE_URL[-20:] if len(settings.DATABASE_URL) > 20 else '***'}")
         return settings
     except Exception as e:
         logger.error("=" * 80)
@@ -100,4 +152,13 @@ def get_settings() -> Settings:
         sys.exit(1)
 
 
-settings = get_settings()
+def __getattr__(name: str):
+    """
+    Build settings on first access (PEP 562).
+
+    `from app.core.config import settings` keeps working, but the
+    environment is only read when something actually needs it.
+    """
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,59 +5,97 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.pool import NullPool
+import asyncio
 import ssl
 import logging
+import os
+import time
+import uuid
+import certifi
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
-# Convert postgres:// to postgresql+asyncpg:// for async driver
-logger.info("Configuring database connection...")
-database_url = settings.DATABASE_URL
-
-if database_url.startswith("postgres://"):
-    database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
-    logger.info("✓ Converted postgres:// to postgresql+asyncpg://")
-elif database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-    logger.info("✓ Converted postgresql:// to postgresql+asyncpg://")
-
-# Remove sslmode and channel_binding from URL (asyncpg handles SSL differently)
-if "?" in database_url:
-    base_url, query_string = database_url.split("?", 1)
-    params = query_string.split("&")
-    # Filter out parameters that asyncpg doesn't understand
-    filtered_params = [p for p in params if not p.startswith(("sslmode=", "channel_binding=", "ssl="))]
-    if filtered_params:
-        database_url = base_url + "?" + "&".join(filtered_params)
-    else:
-        database_url = base_url
-    logger.info("✓ Removed incompatible SSL parameters from URL")
-
-# Create SSL context for Neon (requires SSL)
-ssl_context = ssl.create_default_context()
-ssl_context.check_hostname = False
-ssl_context.verify_mode = ssl.CERT_NONE
-
-logger.info("✓ Created SSL context for database connection")
+# Normalise DATABASE_URL for asyncpg in one pass: switch postgres:// and
+# postgresql:// to postgresql+asyncpg://, and drop query parameters asyncpg
+# doesn't understand (it takes SSL settings via connect_args instead)
+_ASYNCPG_SCHEMES = {"postgres", "postgresql"}
+_UNSUPPORTED_PARAMS = {"sslmode", "channel_binding", "ssl"}
+
+_url = urlsplit(settings.DATABASE_URL)
+database_url = urlunsplit((
+    "postgresql+asyncpg" if _url.scheme in _ASYNCPG_SCHEMES else _url.scheme,
+    _url.netloc,
+    _url.path,
+    urlencode([
+        (key, value)
+        for key, value in parse_qsl(_url.query, keep_blank_values=True)
+        if key not in _UNSUPPORTED_PARAMS
+    ]),
+    _url.fragment,
+))
+
+# SSL context for Neon (requires SSL), built once per process. Production
+# verifies the server certificate against certifi's CA bundle; other
+# environments skip verification, which also skips loading a trust store.
+# Under test no SSL is configured at all.
+connect_args = {}
+if settings.ENVIRONMENT == "production":
+    connect_args["ssl"] = ssl.create_default_context(cafile=certifi.where())
+elif settings.ENVIRONMENT != "test":
+    connect_args["ssl"] = ssl._create_unverified_context()
+
+# Prepared statements are cached per connection, so repeated queries skip
+# the server-side parse/plan. Behind Neon's pooler (PgBouncer, transaction
+# mode) a statement may be replayed on another backend, so names are made
+# unique rather than asyncpg's per-connection counter.
+connect_args["prepared_statement_cache_size"] = 256
+if settings.SERVERLESS:
+    connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+
+# Pool connections in long-lived workers so requests skip the TCP+TLS
+# handshake; per-request runtimes keep NullPool and rely on Neon's pooler
+if settings.SERVERLESS:
+    pool_args = {"poolclass": NullPool}
+else:
+    pool_args = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": 30,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": 300,  # Neon suspends idle computes after ~5 minutes
+    }
 
 # Create async engine with SSL
 try:
     engine = create_async_engine(
         database_url,
-        echo=settings.DEBUG,
-        poolclass=NullPool,  # Recommended for serverless PostgreSQL
-        connect_args={
-            "ssl": ssl_context,
-        },
+        echo=settings.DEBUG and settings.ENVIRONMENT != "production",  # never log SQL in production
+        connect_args=connect_args,
+        **pool_args,
     )
-    logger.info("✓ Database engine created successfully")
 except Exception as e:
     logger.error(f"✗ Failed to create database engine: {str(e)}")
     raise
 
+async def warm_up_pool() -> None:
+    """
+    Open DB_POOL_SIZE connections at startup so the first requests after a
+    deploy don't each pay the TCP+TLS+auth handshake. No-op with NullPool.
+    """
+    if settings.SERVERLESS:
+        return
+    
+    # Hold them all at once, otherwise the pool would hand back the same one
+    connections = await asyncio.gather(
+        *(engine.connect().start() for _ in range(settings.DB_POOL_SIZE))
+    )
+    await asyncio.gather(*(conn.close() for conn in connections))
+
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -74,14 +112,35 @@ class Base(DeclarativeBase):
     pass
 
 
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7) for primary key defaults.
+    
+    The leading 48 bits are the Unix time in milliseconds, so new rows land at
+    the right-hand edge of the primary key B-tree instead of at random pages.
+    """
+    unix_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (unix_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76                      # version
+        | (rand >> 64 & 0xFFF) << 64     # rand_a
+        | 0b10 << 62                     # variant
+        | rand & 0x3FFF_FFFF_FFFF_FFFF   # rand_b
+    )
+    return uuid.UUID(int=value)
+
+
 async def get_db() -> AsyncSession:
     """
     Dependency that provides a database session.
+    
+    Handlers that write call `await db.commit()` themselves, so read-only
+    requests finish without an extra COMMIT round trip.
     """
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -2,25 +2,73 @@
 # FINSIGHT AI - SECURITY & AUTHENTICATION
 # ============================================
 
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
+from types import SimpleNamespace
 from typing import Optional
-from jose import JWTError, jwt
+import hashlib
+import time
+import uuid
+from cachetools import LRUCache, TTLCache
+import jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, lambda_stmt
 
 from app.core.config import settings
 from app.core.database import get_db
 
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context - fewer bcrypt rounds outside production keeps
+# local logins fast; production keeps passlib's default cost of 12
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=12 if settings.ENVIRONMENT == "production" else 10,
+    bcrypt__ident="2b",
+)
+
+# Trigger passlib's bcrypt backend probe now rather than on the first login.
+# The result doubles as the hash checked for unknown emails, so a failed
+# login costs the same bcrypt round whether or not the account exists.
+DUMMY_PASSWORD_HASH = pwd_context.hash("warmup")
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# JWT verification inputs are static, so build them once
+_SECRET_BYTES = settings.SECRET_KEY.encode()
+_ALGORITHMS = [settings.ALGORITHM]
+_DECODE_OPTIONS = {"require": ["exp", "type", "sub"]}
+
+# Token lifetimes in seconds; "exp" is written as an integer epoch directly
+_ACCESS_TOKEN_SECONDS = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES).total_seconds()
+_REFRESH_TOKEN_SECONDS = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS).total_seconds()
+
+# Profile claims are only trusted while the access token is this young
+# (seconds); older tokens re-read the user row, which bounds how long /me
+# can lag a profile edit or deactivation.
+_PROFILE_CLAIMS_MAX_AGE = 15 * 60
+
+# blake2b(token) -> verified payload, so clients polling with the same bearer
+# token skip signature verification. Entries are re-checked against "exp".
+_token_cache = LRUCache(maxsize=4096)
+
+# user_id -> (organisation id, subscription tier). Tiers only change on Stripe
+# webhooks, so a short TTL bounds staleness across workers; this worker
+# clears it directly.
+_tier_cache = TTLCache(maxsize=10_000, ttl=60)
+
+# Tier hierarchy: trial < essentials < professional < enterprise
+_TIER_LEVEL = {
+    "trial": 0,
+    "essentials": 1,
+    "professional": 2,
+    "enterprise": 3,
+}
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
@@ -32,28 +80,50 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    verify_password() off the event loop. bcrypt releases the GIL, so
+    concurrent logins run in parallel on the threadpool.
+    """
+    return await run_in_threadpool(pwd_context.verify, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash() off the event loop."""
+    return await run_in_threadpool(pwd_context.hash, password)
+
+
+def user_token_claims(user) -> dict:
+    """
+    Access-token claims for a user: the subject plus the read-only profile
+    fields /me returns, so get_current_user_profile() needs no database hit.
+    """
+    return {
+        "sub": str(user.id),
+        "email": user.email,
+        "full_name": user.full_name,
+        "job_title": user.job_title,
+        "is_active": user.is_active,
+        "is_verified": user.is_verified,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+        "last_login_at": user.last_login_at.isoformat() if user.last_login_at else None,
+    }
+
+
 def create_access_token(
     data: dict,
     expires_delta: Optional[timedelta] = None
 ) -> str:
     """Create a JWT access token."""
-    to_encode = data.copy()
-    
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
-    
-    to_encode.update({
-        "exp": expire,
-        "type": "access"
-    })
+    now = time.time()
+    expire = now + (
+        expires_delta.total_seconds() if expires_delta else _ACCESS_TOKEN_SECONDS
+    )
+    to_encode = {**data, "iat": int(now), "exp": int(expire), "type": "access"}
     
     encoded_jwt = jwt.encode(
         to_encode,
-        settings.SECRET_KEY,
+        _SECRET_BYTES,
         algorithm=settings.ALGORITHM
     )
     return encoded_jwt
@@ -61,19 +131,12 @@ def create_access_token(
 
 def create_refresh_token(data: dict) -> str:
     """Create a JWT refresh token (longer lived)."""
-    to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(
-        days=settings.REFRESH_TOKEN_EXPIRE_DAYS
-    )
-    
-    to_encode.update({
-        "exp": expire,
-        "type": "refresh"
-    })
+    expire = time.time() + _REFRESH_TOKEN_SECONDS
+    to_encode = {**data, "exp": int(expire), "type": "refresh"}
     
     encoded_jwt = jwt.encode(
         to_encode,
-        settings.SECRET_KEY,
+        _SECRET_BYTES,
         algorithm=settings.ALGORITHM
     )
     return encoded_jwt
@@ -81,19 +144,29 @@ def create_refresh_token(data: dict) -> str:
 
 def decode_token(token: str) -> dict:
     """Decode and validate a JWT token."""
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = _token_cache.get(key)
+    if payload is not None and payload["exp"] > time.time():
+        return payload
+    
+    # Cache miss or expired entry - full verification (rejects expired tokens)
     try:
         payload = jwt.decode(
             token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
+            _SECRET_BYTES,
+            algorithms=_ALGORITHMS,
+            options=_DECODE_OPTIONS,
         )
-        return payload
-    except JWTError:
+    except jwt.PyJWTError:
+        _token_cache.pop(key, None)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    _token_cache[key] = payload
+    return payload
 
 
 async def get_current_user(
@@ -114,16 +187,17 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_id: str = payload.get("sub")
-    if user_id is None:
+    try:
+        user_id = uuid.UUID(payload.get("sub"))
+    except (TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
+    # Primary-key lookup: checks the session identity map before querying
+    user = await db.get(User, user_id)
     
     if user is None:
         raise HTTPException(
@@ -141,6 +215,40 @@ async def get_current_user(
     return user
 
 
+async def get_current_user_profile(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Dependency for read-only profile endpoints: the current user as seen in
+    the access token's claims (see user_token_claims), without a database
+    round trip. Claims are only used for the first _PROFILE_CLAIMS_MAX_AGE
+    seconds of a token's life, so they lag profile edits or deactivation by
+    at most that long. Older tokens, tokens issued without the profile
+    claims, and tokens whose is_active claim isn't true fall back to
+    get_current_user(), which rejects disabled accounts.
+    """
+    payload = decode_token(credentials.credentials)
+    
+    if (
+        payload.get("type") != "access"
+        or payload.get("is_active") is not True
+        or payload.get("iat", 0) < time.time() - _PROFILE_CLAIMS_MAX_AGE
+    ):
+        return await get_current_user(credentials, db)
+    
+    return SimpleNamespace(
+        id=payload["sub"],
+        email=payload["email"],
+        full_name=payload.get("full_name"),
+        job_title=payload.get("job_title"),
+        is_active=True,
+        is_verified=payload.get("is_verified", False),
+        created_at=payload.get("created_at"),
+        last_login_at=payload.get("last_login_at"),
+    )
+
+
 async def get_current_active_user(
     current_user = Depends(get_current_user)
 ):
@@ -153,53 +261,55 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_user_organisation_tier(db: AsyncSession, user_id: uuid.UUID):
+    """
+    Return the (id, subscription_tier) row of the user's organisation, or None
+    if they have no membership. Cached per user; see clear_tier_cache().
+    """
+    from app.models.organisation import OrganisationMember, Organisation
+    
+    row = _tier_cache.get(user_id)
+    if row is not None:
+        return row
+    
+    # Membership and organisation tier in a single round trip
+    result = await db.execute(
+        lambda_stmt(
+            lambda: select(Organisation.id, Organisation.subscription_tier)
+            .join(OrganisationMember, OrganisationMember.organisation_id == Organisation.id)
+            .where(OrganisationMember.user_id == user_id)
+            .limit(1)
+        )
+    )
+    row = result.first()
+    
+    if row is not None:
+        _tier_cache[user_id] = row
+    return row
+
+
 def require_subscription_tier(required_tier: str):
     """
     Dependency factory to require a minimum subscription tier.
     Tier hierarchy: trial < essentials < professional < enterprise
     """
-    tier_levels = {
-        "trial": 0,
-        "essentials": 1,
-        "professional": 2,
-        "enterprise": 3
-    }
+    required_level = _TIER_LEVEL.get(required_tier, 0)
     
     async def check_tier(
         current_user = Depends(get_current_user),
         db: AsyncSession = Depends(get_db)
     ):
-        from app.models.organisation import OrganisationMember, Organisation
-        
-        result = await db.execute(
-            select(OrganisationMember)
-            .where(OrganisationMember.user_id == current_user.id)
-            .limit(1)
-        )
-        membership = result.scalar_one_or_none()
+        org = await get_user_organisation_tier(db, current_user.id)
         
-        if not membership:
+        if org is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="User is not a member of any organisation"
             )
         
-        org_result = await db.execute(
-            select(Organisation)
-            .where(Organisation.id == membership.organisation_id)
-        )
-        organisation = org_result.scalar_one_or_none()
+        tier = org.subscription_tier
         
-        if not organisation:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Organisation not found"
-            )
-        
-        user_tier_level = tier_levels.get(organisation.subscription_tier, 0)
-        required_tier_level = tier_levels.get(required_tier, 0)
-        
-        if user_tier_level < required_tier_level:
+        if _TIER_LEVEL.get(tier, 0) < required_level:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"This feature requires {required_tier} subscription or higher"
@@ -208,3 +318,14 @@ def require_subscription_tier(required_tier: str):
         return current_user
     
     return check_tier
+
+
+def clear_tier_cache(user_id: Optional[uuid.UUID] = None) -> None:
+    """
+    Drop cached subscription tiers (call after a tier or membership changes).
+    Pass user_id to drop just that user's entry.
+    """
+    if user_id is None:
+        _tier_cache.clear()
+    else:
+        _tier_cache.pop(user_id, None)
@@ -10,51 +10,113 @@ Website: https://www.finsightai.tech
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import importlib
 import logging
+import logging.config
 import os
 
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.routers import auth, users, organisations, subscriptions, dashboards, demo
+from app.core.database import engine, Base, warm_up_pool
+from app.services.last_login import flush_last_logins, flush_last_logins_periodically
+from app.services.demo_views import flush_demo_views, flush_demo_views_periodically
 
 logger = logging.getLogger(__name__)
 
-# Create database tables on startup
+# Application logging - installed at startup rather than as an import side
+# effect; uvicorn keeps ownership of its own loggers
+LOGGING_CONFIG = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "default": {"format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "default"},
+    },
+    "loggers": {
+        "app": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
     import asyncio
+    logging.config.dictConfig(LOGGING_CONFIG)
     try:
-        # Startup: Create tables if they don't exist
         logger.info("=" * 80)
         logger.info("STARTING FINSIGHT AI BACKEND")
         logger.info("=" * 80)
-        logger.info("Connecting to database and creating tables...")
 
-        # Add timeout to prevent indefinite hanging
-        async def create_tables():
-            async with engine.begin() as conn:
-                await conn.run_sync(Base.metadata.create_all)
+        # Schema is owned by Alembic migrations run at deploy time. create_all
+        # costs a catalog round trip per table, so it is opt-in and never
+        # runs outside development/test.
+        if settings.ENVIRONMENT in ("development", "test") and settings.RUN_CREATE_ALL:
+            logger.info("Connecting to database and creating tables...")
+
+            # Add timeout to prevent indefinite hanging
+            async def create_tables():
+                async with engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.create_all)
 
+            try:
+                # 60 second timeout for table creation
+                async with asyncio.timeout(60.0):
+                    await create_tables()
+                logger.info("✓ Database tables created successfully")
+            except asyncio.TimeoutError:
+                logger.warning("⚠ Database table creation timed out after 60 seconds")
+                logger.warning("⚠ Tables may already exist or database is slow - continuing startup")
+                # Continue anyway - tables might already exist
+            except Exception as db_error:
+                logger.error(f"⚠ Database table creation error: {str(db_error)}")
+                logger.warning("⚠ Continuing startup - tables may already exist")
+
+        # Pre-open pooled connections; a database that isn't reachable yet
+        # shouldn't stop the app from starting
         try:
-            # 60 second timeout for table creation
-            await asyncio.wait_for(create_tables(), timeout=60.0)
-            logger.info("✓ Database tables created successfully")
-        except asyncio.TimeoutError:
-            logger.warning("⚠ Database table creation timed out after 60 seconds")
-            logger.warning("⚠ Tables may already exist or database is slow - continuing startup")
-            # Continue anyway - tables might already exist
-        except Exception as db_error:
-            logger.error(f"⚠ Database table creation error: {str(db_error)}")
-            logger.warning("⚠ Continuing startup - tables may already exist")
-            # Continue anyway - in production, tables should already exist
+            async with asyncio.timeout(10.0):
+                await warm_up_pool()
+            logger.info("✓ Database connection pool warmed up")
+        except Exception as pool_error:
+            logger.warning(f"⚠ Could not warm up database pool: {str(pool_error)}")
+
+        # Build the OpenAPI schema now rather than on the first /docs hit;
+        # FastAPI caches it on app.openapi_schema
+        app.openapi()
+
+        # Batched background writes: last_login_at and demo view counts
+        # (see app/services/)
+        flush_tasks = []
+        if not settings.SERVERLESS:
+            flush_tasks = [
+                asyncio.create_task(flush_last_logins_periodically()),
+                asyncio.create_task(flush_demo_views_periodically()),
+            ]
+
+        # Retries of Stripe webhook events that were acknowledged but never
+        # applied; an advisory lock keeps it to one worker at a time
+        retry_tasks = []
+        if settings.STRIPE_WEBHOOK_SECRET and not settings.SERVERLESS:
+            from app.routers.subscriptions import process_pending_stripe_events_periodically
+            retry_tasks.append(asyncio.create_task(process_pending_stripe_events_periodically()))
 
         logger.info("✓ Application startup complete")
         logger.info("=" * 80)
         yield
         # Shutdown: Clean up resources
         logger.info("Shutting down application...")
+        for task in (*flush_tasks, *retry_tasks):
+            task.cancel()
+        if flush_tasks:
+            for flush in (flush_last_logins, flush_demo_views):
+                try:
+                    await flush()
+                except Exception as flush_error:
+                    logger.warning(f"⚠ Could not write buffered updates: {str(flush_error)}")
         await engine.dispose()
         logger.info("✓ Database connections closed")
     except Exception as e:
@@ -92,21 +154,22 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# Configure CORS for Netlify frontend and Cloud Run
-origins = [
+# Configure CORS for Netlify frontend and Cloud Run (fixed at import)
+origins = (
     "https://www.finsightai.tech",
     "https://finsightai.tech",
     "http://localhost:3000",  # Local development
     "http://localhost:5173",  # Vite dev server
-]
+)
 
 # Add Cloud Run URL pattern (will be set after deployment)
 cloud_run_url = os.getenv("CLOUD_RUN_URL", "")
 if cloud_run_url:
-    origins.append(cloud_run_url)
+    origins += (cloud_run_url,)
 
 app.add_middleware(
     CORSMiddleware,
@@ -117,13 +180,19 @@ app.add_middleware(
 )
 
 
-# Include routers
-app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
-app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
-app.include_router(organisations.router, prefix="/api/v1/organisations", tags=["Organisations"])
-app.include_router(subscriptions.router, prefix="/api/v1/subscriptions", tags=["Subscriptions"])
-app.include_router(dashboards.router, prefix="/api/v1/dashboards", tags=["Dashboards"])
-app.include_router(demo.router, prefix="/api/v1/demo", tags=["Demo Access"])
+# Include routers: (module under app.routers, URL prefix, OpenAPI tag)
+ROUTERS = (
+    ("auth", "/api/v1/auth", "Authentication"),
+    ("users", "/api/v1/users", "Users"),
+    ("organisations", "/api/v1/organisations", "Organisations"),
+    ("subscriptions", "/api/v1/subscriptions", "Subscriptions"),
+    ("dashboards", "/api/v1/dashboards", "Dashboards"),
+    ("demo", "/api/v1/demo", "Demo Access"),
+)
+
+for module_name, prefix, tag in ROUTERS:
+    module = importlib.import_module(f"app.routers.{module_name}")
+    app.include_router(module.router, prefix=prefix, tags=[tag])
 
 
 @app.get("/", tags=["Health"])
@@ -139,7 +208,7 @@ async def root():
 
 @app.get("/health", tags=["Health"])
 async def health_check():
-    """Fast health check endpoint for Cloud Run deployment."""
+    """Fast liveness check for Cloud Run deployment - no I/O."""
     return {
         "status": "healthy",
         "service": "FinSight AI API",
@@ -148,32 +217,42 @@ async def health_check():
     }
 
 
+# Last successful DB probe. Monitors poll the detailed health check every few
+# seconds; a short TTL collapses them to one SELECT 1 per window.
+_HEALTH_TTL = 2.0
+_health_cache = {"ts": 0.0, "status": "unknown", "details": None}
+
+
+@app.get("/health/db", tags=["Health"])
 @app.get("/health/detailed", tags=["Health"])
 async def detailed_health_check():
-    """Detailed health check endpoint with database connection test."""
+    """Readiness check with a database connection test (also /health/detailed)."""
     import asyncio
+    import time
     from sqlalchemy import text
 
-    db_status = "unknown"
-    db_details = None
-
-    try:
-        # Test database connection with timeout
-        async with engine.connect() as conn:
-            result = await asyncio.wait_for(
-                conn.execute(text("SELECT 1")),
-                timeout=5.0
-            )
+    now = time.monotonic()
+    if _health_cache["status"] == "connected" and now - _health_cache["ts"] < _HEALTH_TTL:
+        db_status = _health_cache["status"]
+        db_details = _health_cache["details"]
+    else:
+        try:
+            # Test database connection with timeout
+            async with asyncio.timeout(5.0):
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
             db_status = "connected"
             db_details = "Database connection successful"
-    except asyncio.TimeoutError:
-        db_status = "timeout"
-        db_details = "Database connection timed out after 5 seconds"
-        logger.warning(f"Health check: {db_details}")
-    except Exception as e:
-        db_status = "error"
-        db_details = f"Database error: {str(e)}"
-        logger.error(f"Health check: {db_details}")
+        except asyncio.TimeoutError:
+            db_status = "timeout"
+            db_details = "Database connection timed out after 5 seconds"
+            logger.warning(f"Health check: {db_details}")
+        except Exception as e:
+            db_status = "error"
+            db_details = f"Database error: {str(e)}"
+            logger.error(f"Health check: {db_details}")
+
+        _health_cache.update(ts=now, status=db_status, details=db_details)
 
     return {
         "status": "healthy" if db_status == "connected" else "degraded",
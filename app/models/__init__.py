@@ -19,6 +19,7 @@ from app.models.data_source import (
     ConnectionStatus
 )
 from app.models.demo import DemoAccess, ContactInquiry
+from app.models.stripe_event import StripeEvent
 
 
 __all__ = [
@@ -41,4 +42,7 @@ __all__ = [
     # Demo & Contact
     "DemoAccess",
     "ContactInquiry",
+    
+    # Stripe
+    "StripeEvent",
 ]
@@ -2,18 +2,16 @@
 # FINSIGHT AI - DATA SOURCE MODELS
 # ============================================
 
-import uuid
-from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime,
-    ForeignKey, Boolean, Numeric, Enum, JSON
+    Column, Integer, SmallInteger, String, Text, DateTime,
+    ForeignKey, Boolean, Numeric, Enum, JSON, Index, DDL, event, func
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import enum
 
-from app.core.database import Base
+from app.core.database import Base, uuid7
 
 
 class DataSourceType(str, enum.Enum):
@@ -41,31 +39,34 @@ class DataSource(Base):
     """
     __tablename__ = "data_sources"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, index=True)
 
     # Relationship to organisation
-    organisation_id = Column(UUID(as_uuid=True), ForeignKey("organisations.id"), nullable=False)
+    organisation_id = Column(UUID(as_uuid=True), ForeignKey("organisations.id"), nullable=False, index=True)
     
     # Source details
     name = Column(String(255), nullable=False)
     source_type = Column(Enum(DataSourceType), nullable=False)
-    description = Column(Text, nullable=True)
+    
+    # Cold columns (admin/sync flows only) are deferred: left out of normal
+    # loads and raise if touched without options(undefer(...))
+    description = deferred(Column(Text, nullable=True), raiseload=True)
     
     # Connection details (encrypted in production)
-    connection_config = Column(JSON, nullable=True)  # Stores API keys, tokens, etc.
+    connection_config = deferred(Column(JSON, nullable=True), raiseload=True)  # Stores API keys, tokens, etc.
     
     # Status tracking
     status = Column(Enum(ConnectionStatus), default=ConnectionStatus.PENDING)
     last_sync_at = Column(DateTime, nullable=True)
-    last_error = Column(Text, nullable=True)
+    last_error = deferred(Column(Text, nullable=True), raiseload=True)
     
     # Record counts
     records_synced = Column(Integer, default=0)
     
     # Audit fields
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     organisation = relationship("Organisation", back_populates="data_sources")
@@ -81,21 +82,28 @@ class FinancialRecord(Base):
     This is the unified schema for all financial data.
     """
     __tablename__ = "financial_records"
+    __table_args__ = (
+        # Tenant-scoped period slicing: WHERE organisation_id = ? AND record_date BETWEEN ...
+        Index("ix_financial_records_org_date_account", "organisation_id", "record_date", "account_code"),
+        # Yearly range partitions (financial_records_yYYYY) are created by
+        # migrations; date-window queries only touch the matching years
+        {"postgresql_partition_by": "RANGE (record_date)"},
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, index=True)
 
     # Relationships
-    data_source_id = Column(UUID(as_uuid=True), ForeignKey("data_sources.id"), nullable=False)
+    data_source_id = Column(UUID(as_uuid=True), ForeignKey("data_sources.id"), nullable=False, index=True)
     organisation_id = Column(UUID(as_uuid=True), ForeignKey("organisations.id"), nullable=False)
     
     # Record identification
     external_id = Column(String(255), nullable=True)  # ID from source system
     record_type = Column(String(50), nullable=False)  # e.g., "journal", "invoice", "payment"
     
-    # Date fields
-    record_date = Column(DateTime, nullable=False)
-    period_year = Column(Integer, nullable=False)
-    period_month = Column(Integer, nullable=False)
+    # Date fields (record_date is the partition key, so part of the primary key)
+    record_date = Column(DateTime, primary_key=True, nullable=False)
+    period_year = Column(SmallInteger, nullable=False)
+    period_month = Column(SmallInteger, nullable=False)
     
     # Account structure
     account_code = Column(String(50), nullable=False)
@@ -129,8 +137,8 @@ class FinancialRecord(Base):
     extra_data = Column(JSON, nullable=True)
     
     # Audit fields
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     data_source = relationship("DataSource", back_populates="financial_records")
@@ -138,3 +146,13 @@ class FinancialRecord(Base):
 
     def __repr__(self):
         return f"<FinancialRecord {self.account_code} {self.record_date} {self.amount_actual}>"
+
+
+# Rows outside every yearly partition land here, so inserts never fail on a
+# missing range (also makes create_all'd development databases writable)
+event.listen(
+    FinancialRecord.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS financial_records_default PARTITION OF financial_records DEFAULT")
+    .execute_if(dialect="postgresql"),
+)
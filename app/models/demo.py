@@ -4,12 +4,15 @@ FinSight AI - Demo Access Model
 SQLAlchemy model for demo access requests (email-gated demo).
 """
 
-import uuid
-from datetime import datetime, timedelta
-from sqlalchemy import Column, String, Boolean, DateTime, Text
+import hashlib
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import (
+    Column, String, Boolean, DateTime, Text, Integer, BigInteger,
+    Computed, Index, and_, func
+)
 from sqlalchemy.dialects.postgresql import UUID
 
-from app.core.database import Base
+from app.core.database import Base, uuid7
 
 
 class DemoAccess(Base):
@@ -25,12 +28,12 @@ class DemoAccess(Base):
     id = Column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         index=True
     )
     
     # Contact information
-    email = Column(String(255), unique=True, index=True, nullable=False)
+    email = Column(String(255), nullable=False)  # unique case-insensitively, see below
     full_name = Column(String(255), nullable=True)
     company_name = Column(String(255), nullable=True)
     job_title = Column(String(255), nullable=True)
@@ -44,16 +47,24 @@ class DemoAccess(Base):
     # Interest/Message
     message = Column(Text, nullable=True)
     
-    # Access token (for demo URL)
-    access_token = Column(String(255), unique=True, index=True, nullable=False)
+    # Access token (for demo URL). Lookups go through the unique 8-byte hash
+    # below (first 64 bits of md5, computed by Postgres) rather than a B-tree
+    # over the token string; see token_lookup().
+    access_token = Column(String(255), nullable=False)
+    access_token_hash = Column(
+        BigInteger,
+        Computed("('x' || substr(md5(access_token), 1, 16))::bit(64)::bigint", persisted=True),
+        unique=True,
+        index=True
+    )
     
     # Access tracking
     demo_viewed = Column(Boolean, default=False)
-    demo_viewed_at = Column(DateTime, nullable=True)
-    demo_view_count = Column(String(10), default="0")
+    demo_viewed_at = Column(DateTime(timezone=True), nullable=True)
+    demo_view_count = Column(Integer, default=0, nullable=False)
     
     # Token expiry (optional - demo access for 7 days)
-    expires_at = Column(DateTime, nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=True)
     
     # Marketing consent
     marketing_consent = Column(Boolean, default=False)
@@ -66,24 +77,35 @@ class DemoAccess(Base):
     
     # Conversion tracking
     converted_to_trial = Column(Boolean, default=False)
-    converted_at = Column(DateTime, nullable=True)
+    converted_at = Column(DateTime(timezone=True), nullable=True)
     user_id = Column(UUID(as_uuid=True), nullable=True)  # Link if they sign up
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    @classmethod
+    def token_lookup(cls, token: str):
+        """WHERE clause for a token: probe the hash index, then confirm the token."""
+        digest = hashlib.md5(token.encode(), usedforsecurity=False).digest()
+        token_hash = int.from_bytes(digest[:8], "big", signed=True)
+        return and_(cls.access_token_hash == token_hash, cls.access_token == token)
     
     @property
     def is_expired(self) -> bool:
         """Check if demo access has expired."""
         if self.expires_at is None:
             return False
-        return datetime.utcnow() > self.expires_at
+        return datetime.now(timezone.utc) > self.expires_at
     
     def __repr__(self):
         return f"<DemoAccess {self.email}>"
 
 
+# One demo signup per address regardless of case; lookups filter on lower(email)
+Index("ix_demo_access_email_lower", func.lower(DemoAccess.email), unique=True)
+
+
 class ContactInquiry(Base):
     """
     Contact inquiry model - stores contact form submissions.
@@ -96,12 +118,12 @@ class ContactInquiry(Base):
     id = Column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         index=True
     )
     
     # Contact information
-    email = Column(String(255), nullable=False, index=True)
+    email = Column(String(255), nullable=False)  # indexed on lower(email), see below
     full_name = Column(String(255), nullable=False)
     company_name = Column(String(255), nullable=True)
     phone = Column(String(50), nullable=True)
@@ -119,11 +141,14 @@ class ContactInquiry(Base):
     notes = Column(Text, nullable=True)
     
     # Response tracking
-    responded_at = Column(DateTime, nullable=True)
+    responded_at = Column(DateTime(timezone=True), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     def __repr__(self):
         return f"<ContactInquiry {self.email}>"
+
+
+Index("ix_contact_inquiries_email_lower", func.lower(ContactInquiry.email))
@@ -4,14 +4,12 @@ FinSight AI - Organisation Model
 SQLAlchemy models for organisations (tenants) and memberships.
 """
 
-import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Enum, Text, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
 
-from app.core.database import Base
+from app.core.database import Base, uuid7
 
 
 class SubscriptionTier(str, enum.Enum):
@@ -51,7 +49,7 @@ class Organisation(Base):
     id = Column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         index=True
     )
     
@@ -69,9 +67,11 @@ class Organisation(Base):
     billing_email = Column(String(255), nullable=True)
     billing_address = Column(Text, nullable=True)
     
-    # Subscription
+    # Subscription. Tier is a native ENUM (labels in tier order) but still
+    # reads/writes plain strings. Status stays a string: webhooks store
+    # Stripe's status values verbatim.
     subscription_tier = Column(
-        String(50),
+        Enum(*(tier.value for tier in SubscriptionTier), name="subscription_tier"),
         default=SubscriptionTier.TRIAL.value,
         nullable=False
     )
@@ -80,15 +80,15 @@ class Organisation(Base):
         default=SubscriptionStatus.TRIAL.value,
         nullable=False
     )
-    trial_ends_at = Column(DateTime, nullable=True)
+    trial_ends_at = Column(DateTime(timezone=True), nullable=True)
     
     # Stripe
     stripe_customer_id = Column(String(255), nullable=True, unique=True)
     stripe_subscription_id = Column(String(255), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
     members = relationship(
@@ -118,12 +118,17 @@ class OrganisationMember(Base):
     A user can belong to multiple organisations with different roles.
     """
     __tablename__ = "organisation_members"
+    __table_args__ = (
+        # "Which organisation/role is this user in" is answered from the
+        # index alone; also serves every lookup by user_id
+        Index("ix_org_members_user_org", "user_id", "organisation_id", "role"),
+    )
     
     # Primary key
     id = Column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         index=True
     )
     
@@ -137,13 +142,12 @@ class OrganisationMember(Base):
     user_id = Column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     
     # Role within organisation
     role = Column(
-        String(50),
+        Enum(*(role.value for role in MemberRole), name="member_role"),
         default=MemberRole.MEMBER.value,
         nullable=False
     )
@@ -154,11 +158,11 @@ class OrganisationMember(Base):
         ForeignKey("users.id"),
         nullable=True
     )
-    invitation_token = Column(String(255), nullable=True)
-    invitation_accepted_at = Column(DateTime, nullable=True)
+    invitation_token = Column(UUID(as_uuid=True), nullable=True)
+    invitation_accepted_at = Column(DateTime(timezone=True), nullable=True)
     
     # Timestamps
-    joined_at = Column(DateTime, default=datetime.utcnow)
+    joined_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     organisation = relationship("Organisation", back_populates="members")
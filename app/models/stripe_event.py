@@ -0,0 +1,54 @@
+"""
+FinSight AI - Stripe Event Model
+================================
+SQLAlchemy model for received Stripe webhook events.
+"""
+
+from sqlalchemy import Column, String, DateTime, SmallInteger, Text, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.database import Base
+
+
+class StripeEvent(Base):
+    """
+    Stripe webhook event, recorded before the webhook is acknowledged.
+    
+    The event id primary key makes redeliveries idempotent across workers
+    and restarts. Rows with processed_at unset have been acknowledged but
+    not applied yet; they are retried until attempts reaches the limit.
+    Whoever applies an event claims the row first (processing_started_at),
+    so a redelivery or a retry can't apply it a second time concurrently.
+    """
+    __tablename__ = "stripe_events"
+    
+    event_id = Column(String(255), primary_key=True)  # Stripe's evt_... id
+    type = Column(String(100), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    
+    # Ordering: the subscription an event is about and when Stripe created
+    # it, so a late or retried event can't overwrite a newer one
+    subscription_id = Column(String(255), nullable=True)
+    event_created_at = Column(DateTime(timezone=True), nullable=True)
+    
+    received_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    processing_started_at = Column(DateTime(timezone=True), nullable=True)  # set while claimed
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Failed processing attempts and the most recent error
+    attempts = Column(SmallInteger, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
+    
+    __table_args__ = (
+        # The retry sweep only looks for unapplied events
+        Index(
+            "ix_stripe_events_pending",
+            "received_at",
+            postgresql_where=text("processed_at IS NULL"),
+        ),
+        # "Has a newer event for this subscription been applied?"
+        Index("ix_stripe_events_subscription", "subscription_id", "event_created_at"),
+    )
+    
+    def __repr__(self):
+        return f"<StripeEvent {self.event_id} ({self.type})>"
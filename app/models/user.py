@@ -4,13 +4,11 @@ FinSight AI - User Model
 SQLAlchemy model for users.
 """
 
-import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, Text
+from sqlalchemy import Column, String, Boolean, DateTime, Text, Index, text, func
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 
-from app.core.database import Base
+from app.core.database import Base, uuid7
 
 
 class User(Base):
@@ -20,18 +18,32 @@ class User(Base):
     Users can belong to multiple organisations through OrganisationMember.
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # Token lookups; almost every row is NULL, so index only live tokens
+        Index(
+            "ix_users_password_reset_token",
+            "password_reset_token",
+            postgresql_where=text("password_reset_token IS NOT NULL"),
+        ),
+        Index(
+            "ix_users_verification_token",
+            "verification_token",
+            postgresql_where=text("verification_token IS NOT NULL"),
+        ),
+    )
     
     # Primary key
     id = Column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         index=True
     )
     
-    # Authentication
+    # Authentication. Credential and token columns are deferred: they are
+    # only read by login/password flows, which undefer or select them.
     email = Column(String(255), unique=True, index=True, nullable=False)
-    hashed_password = Column(String(255), nullable=False)
+    hashed_password = deferred(Column(String(60), nullable=False))  # bcrypt output is always 60 chars
     
     # Profile
     full_name = Column(String(255), nullable=True)
@@ -43,21 +55,22 @@ class User(Base):
     is_verified = Column(Boolean, default=False)  # Email verification
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    last_login_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    last_login_at = Column(DateTime(timezone=True), nullable=True)
     
     # Password reset
-    password_reset_token = Column(String(255), nullable=True)
-    password_reset_expires = Column(DateTime, nullable=True)
+    password_reset_token = deferred(Column(UUID(as_uuid=True), nullable=True))
+    password_reset_expires = deferred(Column(DateTime(timezone=True), nullable=True))
     
     # Email verification
-    verification_token = Column(String(255), nullable=True)
+    verification_token = deferred(Column(UUID(as_uuid=True), nullable=True))
     
     # Relationships
     organisation_memberships = relationship(
         "OrganisationMember",
         back_populates="user",
+        foreign_keys="OrganisationMember.user_id",
         cascade="all, delete-orphan"
     )
     
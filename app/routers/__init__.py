@@ -2,9 +2,12 @@
 FinSight AI - API Routers
 =========================
 Export all routers.
+
+Router modules are imported on first attribute access (PEP 562) so that
+importing one router does not pull in every other router's dependencies.
 """
 
-from app.routers import auth, users, organisations, subscriptions, dashboards, demo
+import importlib
 
 __all__ = [
     "auth",
@@ -14,3 +17,9 @@ __all__ = [
     "dashboards",
     "demo",
 ]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
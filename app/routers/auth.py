@@ -6,21 +6,27 @@ API endpoints for user authentication.
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, exists
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import undefer
 from datetime import datetime, timezone
 
 from app.core.database import get_db
 from app.core.security import (
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
+    DUMMY_PASSWORD_HASH,
+    user_token_claims,
     create_access_token,
     create_refresh_token,
     decode_token,
     get_current_user,
+    get_current_user_profile,
 )
 from app.core.config import settings
 from app.models.user import User
 from app.models.organisation import Organisation, OrganisationMember, MemberRole
+from app.services.last_login import record_login
 from app.schemas.auth import (
     UserRegister,
     UserLogin,
@@ -37,13 +43,65 @@ import re
 
 router = APIRouter()
 
+# Attempts at a free "<slug>-N" before giving up on registration
+MAX_SLUG_ATTEMPTS = 5
+
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+# Unique-constraint names as they appear in IntegrityError messages
+# (Postgres index name, SQLite "table.column")
+_SLUG_CONSTRAINTS = ("ix_organisations_slug", "organisations.slug")
+_EMAIL_CONSTRAINTS = ("ix_users_email", "users.email")
+
+
+def _violates(exc: IntegrityError, constraints: tuple) -> bool:
+    """Whether an IntegrityError comes from one of the named unique constraints."""
+    message = str(exc.orig)
+    return any(name in message for name in constraints)
+
 
 def generate_slug(name: str) -> str:
-    """Generate a URL-friendly slug from a name."""
-    slug = name.lower()
-    slug = re.sub(r'[^a-z0-9]+', '-', slug)
-    slug = slug.strip('-')
-    return f"{slug}-{str(uuid.uuid4())[:8]}"
+    """Generate a URL-friendly slug from a name (without a uniqueness suffix)."""
+    slug = _SLUG_RE.sub('-', name.lower()).strip('-')[:90]
+    return slug or "organisation"
+
+
+async def add_organisation_with_unique_slug(db: AsyncSession, org: Organisation, *related) -> None:
+    """
+    Insert org (and any related rows, in the same flush), appending "-2",
+    "-3", ... to its slug if the slug is taken.
+    
+    Each attempt runs in a savepoint so a collision doesn't abort the
+    surrounding transaction.
+    """
+    base_slug = org.slug
+    suffix = None
+    
+    for attempt in range(MAX_SLUG_ATTEMPTS):
+        org.slug = base_slug if suffix is None else f"{base_slug}-{suffix}"
+        try:
+            async with db.begin_nested():
+                db.add_all([org, *related])
+            return
+        except IntegrityError as exc:
+            if not _violates(exc, _SLUG_CONSTRAINTS):
+                raise
+        
+        if suffix is None:
+            # Start past every existing "<base>..." slug rather than probing 2, 3, ...
+            taken = await db.scalar(
+                select(func.count())
+                .select_from(Organisation)
+                .where(Organisation.slug.like(f"{base_slug}%"))
+            )
+            suffix = taken + 1
+        else:
+            suffix += 1
+    
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Could not allocate an organisation slug, please try again"
+    )
 
 
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
@@ -57,18 +115,17 @@ async def register(
     Creates a new user and an organisation for them.
     Returns access and refresh tokens.
     """
-    # Check if user already exists
-    result = await db.execute(select(User).where(User.email == user_data.email))
-    existing_user = result.scalar_one_or_none()
+    # Check if user already exists (EXISTS: no row data is fetched)
+    email_taken = await db.scalar(select(exists().where(User.email == user_data.email)))
     
-    if existing_user:
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A user with this email already exists"
         )
     
     # Create user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     
     new_user = User(
         email=user_data.email,
@@ -79,9 +136,6 @@ async def register(
         is_verified=False,  # Email verification not implemented yet
     )
     
-    db.add(new_user)
-    await db.flush()  # Get the user ID
-    
     # Create organisation for the user
     org_name = user_data.company_name or f"{user_data.full_name}'s Organisation"
     org_slug = generate_slug(org_name)
@@ -94,21 +148,28 @@ async def register(
         billing_email=user_data.email,
     )
     
-    db.add(new_org)
-    await db.flush()
-    
-    # Add user as owner of the organisation
+    # Add user as owner of the organisation. Linking through the
+    # relationships lets a single flush insert all three rows.
     membership = OrganisationMember(
-        organisation_id=new_org.id,
-        user_id=new_user.id,
+        organisation=new_org,
+        user=new_user,
         role=MemberRole.OWNER.value,
     )
     
-    db.add(membership)
+    try:
+        await add_organisation_with_unique_slug(db, new_org, new_user, membership)
+    except IntegrityError as exc:
+        # A concurrent registration took the email after the check above
+        if _violates(exc, _EMAIL_CONSTRAINTS):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A user with this email already exists"
+            )
+        raise
     await db.commit()
     
     # Generate tokens
-    access_token = create_access_token(data={"sub": str(new_user.id)})
+    access_token = create_access_token(data=user_token_claims(new_user))
     refresh_token = create_refresh_token(data={"sub": str(new_user.id)})
     
     return TokenResponse(
@@ -128,18 +189,21 @@ async def login(
     Authenticate user and return tokens.
     """
     # Find user by email
-    result = await db.execute(select(User).where(User.email == credentials.email))
+    result = await db.execute(
+        select(User)
+        .options(undefer(User.hashed_password))
+        .where(User.email == credentials.email)
+    )
     user = result.scalar_one_or_none()
     
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    # Verify password (against a dummy hash for unknown emails, so response
+    # time doesn't reveal whether the account exists)
+    password_ok = await verify_password_async(
+        credentials.password,
+        user.hashed_password if user else DUMMY_PASSWORD_HASH,
+    )
     
-    # Verify password
-    if not verify_password(credentials.password, user.hashed_password):
+    if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -153,12 +217,16 @@ async def login(
             detail="User account is disabled"
         )
     
-    # Update last login timestamp
+    # Update last login timestamp. Long-lived workers batch the write in the
+    # background; per-request runtimes have no background loop, so commit now.
     user.last_login_at = datetime.now(timezone.utc)
-    await db.commit()
+    if settings.SERVERLESS:
+        await db.commit()
+    else:
+        record_login(user.id, user.last_login_at)
     
     # Generate tokens
-    access_token = create_access_token(data={"sub": str(user.id)})
+    access_token = create_access_token(data=user_token_claims(user))
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
     
     return TokenResponse(
@@ -187,11 +255,17 @@ async def refresh_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_id = payload.get("sub")
+    try:
+        user_id = uuid.UUID(payload.get("sub"))
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
-    # Verify user still exists and is active
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    # Verify user still exists and is active (primary-key lookup)
+    user = await db.get(User, user_id)
     
     if not user or not user.is_active:
         raise HTTPException(
@@ -201,7 +275,7 @@ async def refresh_token(
         )
     
     # Generate new tokens
-    access_token = create_access_token(data={"sub": str(user.id)})
+    access_token = create_access_token(data=user_token_claims(user))
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
     
     return TokenResponse(
@@ -226,20 +300,11 @@ async def logout(current_user: User = Depends(get_current_user)):
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_user_profile)):
     """
     Get current authenticated user's information.
     """
-    return UserResponse(
-        id=str(current_user.id),
-        email=current_user.email,
-        full_name=current_user.full_name,
-        job_title=current_user.job_title,
-        is_active=current_user.is_active,
-        is_verified=current_user.is_verified,
-        created_at=current_user.created_at,
-        last_login_at=current_user.last_login_at,
-    )
+    return UserResponse.model_validate(current_user)
 
 
 @router.post("/password-reset")
@@ -259,7 +324,7 @@ async def request_password_reset(
     # Always return success to prevent email enumeration
     if user:
         # Generate reset token
-        reset_token = str(uuid.uuid4())
+        reset_token = uuid.uuid4()
         user.password_reset_token = reset_token
         user.password_reset_expires = datetime.now(timezone.utc)
         await db.commit()
@@ -281,10 +346,17 @@ async def confirm_password_reset(
     """
     Confirm password reset with token.
     """
-    result = await db.execute(
-        select(User).where(User.password_reset_token == data.token)
-    )
-    user = result.scalar_one_or_none()
+    try:
+        token = uuid.UUID(data.token)
+    except ValueError:
+        token = None
+    
+    user = None
+    if token is not None:
+        result = await db.execute(
+            select(User).where(User.password_reset_token == token)
+        )
+        user = result.scalar_one_or_none()
     
     if not user:
         raise HTTPException(
@@ -293,7 +365,7 @@ async def confirm_password_reset(
         )
     
     # Update password
-    user.hashed_password = get_password_hash(data.new_password)
+    user.hashed_password = await get_password_hash_async(data.new_password)
     user.password_reset_token = None
     user.password_reset_expires = None
     await db.commit()
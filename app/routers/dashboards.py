@@ -5,155 +5,171 @@ API endpoints for dashboard access based on subscription tier.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import List, Optional
+from dataclasses import dataclass, asdict
+import orjson
 
 from app.core.database import get_db
-from app.core.security import get_current_user, require_subscription_tier
+from app.core.security import (
+    get_current_user,
+    require_subscription_tier,
+    get_user_organisation_tier,
+)
 from app.models.user import User
-from app.models.organisation import Organisation, OrganisationMember
 from app.schemas.organisation import SubscriptionTierEnum, TIER_FEATURES
 
 
 router = APIRouter()
 
 
+@dataclass(frozen=True, slots=True)
+class Dashboard:
+    """A dashboard definition and the tier required to open it."""
+    id: str
+    name: str
+    description: str
+    tier_required: str
+    type: str
+    category: str
+
+
 # Dashboard definitions with tier requirements
 DASHBOARDS = {
     # Essentials tier dashboards (Streamlit)
-    "budget-vs-actual": {
-        "id": "budget-vs-actual",
-        "name": "Budget vs Actual",
-        "description": "Compare actual performance against budget with variance analysis",
-        "tier_required": "essentials",
-        "type": "streamlit",
-        "category": "core",
-    },
-    "cash-flow": {
-        "id": "cash-flow",
-        "name": "Cash Flow Analysis",
-        "description": "13-week rolling cash flow forecast and analysis",
-        "tier_required": "essentials",
-        "type": "streamlit",
-        "category": "core",
-    },
-    "pl-analysis": {
-        "id": "pl-analysis",
-        "name": "P&L Analysis",
-        "description": "Profit & Loss breakdown with trend analysis",
-        "tier_required": "essentials",
-        "type": "streamlit",
-        "category": "core",
-    },
-    "kpi-overview": {
-        "id": "kpi-overview",
-        "name": "KPI Dashboard",
-        "description": "Key performance indicators at a glance",
-        "tier_required": "essentials",
-        "type": "streamlit",
-        "category": "core",
-    },
-    "variance-analysis": {
-        "id": "variance-analysis",
-        "name": "Variance Analysis",
-        "description": "Detailed variance breakdown by department and account",
-        "tier_required": "essentials",
-        "type": "streamlit",
-        "category": "core",
-    },
+    "budget-vs-actual": Dashboard(
+        id="budget-vs-actual",
+        name="Budget vs Actual",
+        description="Compare actual performance against budget with variance analysis",
+        tier_required="essentials",
+        type="streamlit",
+        category="core",
+    ),
+    "cash-flow": Dashboard(
+        id="cash-flow",
+        name="Cash Flow Analysis",
+        description="13-week rolling cash flow forecast and analysis",
+        tier_required="essentials",
+        type="streamlit",
+        category="core",
+    ),
+    "pl-analysis": Dashboard(
+        id="pl-analysis",
+        name="P&L Analysis",
+        description="Profit & Loss breakdown with trend analysis",
+        tier_required="essentials",
+        type="streamlit",
+        category="core",
+    ),
+    "kpi-overview": Dashboard(
+        id="kpi-overview",
+        name="KPI Dashboard",
+        description="Key performance indicators at a glance",
+        tier_required="essentials",
+        type="streamlit",
+        category="core",
+    ),
+    "variance-analysis": Dashboard(
+        id="variance-analysis",
+        name="Variance Analysis",
+        description="Detailed variance breakdown by department and account",
+        tier_required="essentials",
+        type="streamlit",
+        category="core",
+    ),
     
     # Professional tier dashboards (Tableau)
-    "scenario-planning": {
-        "id": "scenario-planning",
-        "name": "Scenario Planning",
-        "description": "What-if analysis with multiple scenarios",
-        "tier_required": "professional",
-        "type": "tableau",
-        "category": "advanced",
-    },
-    "rolling-forecast": {
-        "id": "rolling-forecast",
-        "name": "Rolling Forecast",
-        "description": "18-month rolling forecast with AI predictions",
-        "tier_required": "professional",
-        "type": "tableau",
-        "category": "advanced",
-    },
-    "department-analysis": {
-        "id": "department-analysis",
-        "name": "Department Analysis",
-        "description": "Deep dive into department-level performance",
-        "tier_required": "professional",
-        "type": "tableau",
-        "category": "advanced",
-    },
-    "executive-summary": {
-        "id": "executive-summary",
-        "name": "Executive Summary",
-        "description": "Board-ready executive financial summary",
-        "tier_required": "professional",
-        "type": "tableau",
-        "category": "advanced",
-    },
-    "cost-centre-analysis": {
-        "id": "cost-centre-analysis",
-        "name": "Cost Centre Analysis",
-        "description": "Detailed cost centre performance tracking",
-        "tier_required": "professional",
-        "type": "tableau",
-        "category": "advanced",
-    },
-    "revenue-analysis": {
-        "id": "revenue-analysis",
-        "name": "Revenue Analysis",
-        "description": "Revenue breakdown by product, region, and customer",
-        "tier_required": "professional",
-        "type": "tableau",
-        "category": "advanced",
-    },
-    "working-capital": {
-        "id": "working-capital",
-        "name": "Working Capital",
-        "description": "Working capital analysis and optimisation",
-        "tier_required": "professional",
-        "type": "tableau",
-        "category": "advanced",
-    },
+    "scenario-planning": Dashboard(
+        id="scenario-planning",
+        name="Scenario Planning",
+        description="What-if analysis with multiple scenarios",
+        tier_required="professional",
+        type="tableau",
+        category="advanced",
+    ),
+    "rolling-forecast": Dashboard(
+        id="rolling-forecast",
+        name="Rolling Forecast",
+        description="18-month rolling forecast with AI predictions",
+        tier_required="professional",
+        type="tableau",
+        category="advanced",
+    ),
+    "department-analysis": Dashboard(
+        id="department-analysis",
+        name="Department Analysis",
+        description="Deep dive into department-level performance",
+        tier_required="professional",
+        type="tableau",
+        category="advanced",
+    ),
+    "executive-summary": Dashboard(
+        id="executive-summary",
+        name="Executive Summary",
+        description="Board-ready executive financial summary",
+        tier_required="professional",
+        type="tableau",
+        category="advanced",
+    ),
+    "cost-centre-analysis": Dashboard(
+        id="cost-centre-analysis",
+        name="Cost Centre Analysis",
+        description="Detailed cost centre performance tracking",
+        tier_required="professional",
+        type="tableau",
+        category="advanced",
+    ),
+    "revenue-analysis": Dashboard(
+        id="revenue-analysis",
+        name="Revenue Analysis",
+        description="Revenue breakdown by product, region, and customer",
+        tier_required="professional",
+        type="tableau",
+        category="advanced",
+    ),
+    "working-capital": Dashboard(
+        id="working-capital",
+        name="Working Capital",
+        description="Working capital analysis and optimisation",
+        tier_required="professional",
+        type="tableau",
+        category="advanced",
+    ),
     
     # Enterprise tier dashboards
-    "predictive-analytics": {
-        "id": "predictive-analytics",
-        "name": "Predictive Analytics",
-        "description": "ML-powered financial predictions and anomaly detection",
-        "tier_required": "enterprise",
-        "type": "tableau",
-        "category": "enterprise",
-    },
-    "multi-entity": {
-        "id": "multi-entity",
-        "name": "Multi-Entity Consolidation",
-        "description": "Consolidated view across multiple entities",
-        "tier_required": "enterprise",
-        "type": "tableau",
-        "category": "enterprise",
-    },
-    "custom-reports": {
-        "id": "custom-reports",
-        "name": "Custom Reports",
-        "description": "Fully customisable reporting templates",
-        "tier_required": "enterprise",
-        "type": "tableau",
-        "category": "enterprise",
-    },
-    "audit-trail": {
-        "id": "audit-trail",
-        "name": "Audit Trail",
-        "description": "Complete audit trail and compliance reporting",
-        "tier_required": "enterprise",
-        "type": "streamlit",
-        "category": "enterprise",
-    },
+    "predictive-analytics": Dashboard(
+        id="predictive-analytics",
+        name="Predictive Analytics",
+        description="ML-powered financial predictions and anomaly detection",
+        tier_required="enterprise",
+        type="tableau",
+        category="enterprise",
+    ),
+    "multi-entity": Dashboard(
+        id="multi-entity",
+        name="Multi-Entity Consolidation",
+        description="Consolidated view across multiple entities",
+        tier_required="enterprise",
+        type="tableau",
+        category="enterprise",
+    ),
+    "custom-reports": Dashboard(
+        id="custom-reports",
+        name="Custom Reports",
+        description="Fully customisable reporting templates",
+        tier_required="enterprise",
+        type="tableau",
+        category="enterprise",
+    ),
+    "audit-trail": Dashboard(
+        id="audit-trail",
+        name="Audit Trail",
+        description="Complete audit trail and compliance reporting",
+        tier_required="enterprise",
+        type="streamlit",
+        category="enterprise",
+    ),
 }
 
 
@@ -173,6 +189,91 @@ def can_access_dashboard(user_tier: str, required_tier: str) -> bool:
     return user_level >= required_level
 
 
+# dashboard_id -> bitmask of tier levels allowed to open it (bit n = level n)
+_ACCESS_MASKS = {
+    dashboard_id: sum(
+        1 << level
+        for tier, level in TIER_HIERARCHY.items()
+        if can_access_dashboard(tier, dashboard.tier_required)
+    )
+    for dashboard_id, dashboard in DASHBOARDS.items()
+}
+
+
+def is_dashboard_accessible(dashboard_id: str, user_tier: str) -> bool:
+    """can_access_dashboard() for a known dashboard id, as one bitwise AND."""
+    return bool(_ACCESS_MASKS[dashboard_id] & (1 << TIER_HIERARCHY.get(user_tier, 0)))
+
+
+# Dashboard categories for the overview endpoint
+DASHBOARD_CATEGORIES = {
+    "core": {"name": "Core Dashboards", "description": "Essential FP&A dashboards"},
+    "advanced": {"name": "Advanced Analytics", "description": "Professional-tier analytics"},
+    "enterprise": {"name": "Enterprise Features", "description": "Full platform capabilities"},
+}
+
+
+def _build_tier_view(tier: str) -> dict:
+    """Dashboard listings for one tier, with the accessible flag baked in."""
+    available = []
+    locked = []
+    categories = {
+        category: {**info, "dashboards": []}
+        for category, info in DASHBOARD_CATEGORIES.items()
+    }
+    
+    for dashboard in DASHBOARDS.values():
+        dashboard_info = {
+            **asdict(dashboard),
+            "accessible": is_dashboard_accessible(dashboard.id, tier),
+        }
+        (available if dashboard_info["accessible"] else locked).append(dashboard_info)
+        categories[dashboard.category]["dashboards"].append(dashboard_info)
+    
+    return {
+        "available_dashboards": available,
+        "locked_dashboards": locked,
+        "total_available": len(available),
+        "total_locked": len(locked),
+        "categories": categories,
+    }
+
+
+# Listings only depend on the tier, so build them once per tier at import.
+# Treat these as read-only: they are shared by every request.
+_TIER_VIEWS = {tier: _build_tier_view(tier) for tier in TIER_HIERARCHY}
+
+
+def get_tier_view(tier: str) -> dict:
+    """Precomputed listings for a tier (unknown tiers get trial access)."""
+    return _TIER_VIEWS.get(tier) or _TIER_VIEWS["trial"]
+
+
+def _available_payload(tier: str) -> dict:
+    """Response body of /available for a tier."""
+    view = get_tier_view(tier)
+    return {
+        "current_tier": tier,
+        "available_dashboards": view["available_dashboards"],
+        "locked_dashboards": view["locked_dashboards"],
+        "total_available": view["total_available"],
+        "total_locked": view["total_locked"],
+    }
+
+
+def _categories_payload(tier: str) -> dict:
+    """Response body of /categories/overview for a tier."""
+    return {
+        "current_tier": tier,
+        "categories": get_tier_view(tier)["categories"],
+    }
+
+
+# Those bodies are also fixed per tier: serialise them once and send the bytes
+_AVAILABLE_BODIES = {tier: orjson.dumps(_available_payload(tier)) for tier in TIER_HIERARCHY}
+_CATEGORIES_BODIES = {tier: orjson.dumps(_categories_payload(tier)) for tier in TIER_HIERARCHY}
+
+
 @router.get("/available")
 async def list_available_dashboards(
     current_user: User = Depends(get_current_user),
@@ -182,54 +283,20 @@ async def list_available_dashboards(
     List all dashboards available to the current user based on their subscription tier.
     """
     # Get user's organisation and subscription tier
-    membership_result = await db.execute(
-        select(OrganisationMember)
-        .where(OrganisationMember.user_id == current_user.id)
-        .limit(1)
-    )
-    membership = membership_result.scalar_one_or_none()
+    org = await get_user_organisation_tier(db, current_user.id)
     
-    if not membership:
+    if not org:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User is not a member of any organisation"
         )
     
-    org_result = await db.execute(
-        select(Organisation).where(Organisation.id == membership.organisation_id)
-    )
-    org = org_result.scalar_one_or_none()
-    
-    if not org:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Organisation not found"
-        )
-    
     user_tier = org.subscription_tier
     
-    # Categorise dashboards
-    available = []
-    locked = []
-    
-    for dashboard_id, dashboard in DASHBOARDS.items():
-        dashboard_info = {
-            **dashboard,
-            "accessible": can_access_dashboard(user_tier, dashboard["tier_required"]),
-        }
-        
-        if dashboard_info["accessible"]:
-            available.append(dashboard_info)
-        else:
-            locked.append(dashboard_info)
-    
-    return {
-        "current_tier": user_tier,
-        "available_dashboards": available,
-        "locked_dashboards": locked,
-        "total_available": len(available),
-        "total_locked": len(locked),
-    }
+    body = _AVAILABLE_BODIES.get(user_tier)
+    if body is None:
+        body = orjson.dumps(_available_payload(user_tier))
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{dashboard_id}")
@@ -250,32 +317,22 @@ async def get_dashboard_info(
     dashboard = DASHBOARDS[dashboard_id]
     
     # Get user's organisation and subscription tier
-    membership_result = await db.execute(
-        select(OrganisationMember)
-        .where(OrganisationMember.user_id == current_user.id)
-        .limit(1)
-    )
-    membership = membership_result.scalar_one_or_none()
+    org = await get_user_organisation_tier(db, current_user.id)
     
-    if not membership:
+    if not org:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User is not a member of any organisation"
         )
     
-    org_result = await db.execute(
-        select(Organisation).where(Organisation.id == membership.organisation_id)
-    )
-    org = org_result.scalar_one_or_none()
-    
-    user_tier = org.subscription_tier if org else "trial"
-    accessible = can_access_dashboard(user_tier, dashboard["tier_required"])
+    user_tier = org.subscription_tier
+    accessible = is_dashboard_accessible(dashboard_id, user_tier)
     
     return {
-        **dashboard,
+        **asdict(dashboard),
         "accessible": accessible,
         "current_tier": user_tier,
-        "upgrade_required": None if accessible else dashboard["tier_required"],
+        "upgrade_required": None if accessible else dashboard.tier_required,
     }
 
 
@@ -299,37 +356,27 @@ async def get_dashboard_access(
     dashboard = DASHBOARDS[dashboard_id]
     
     # Get user's organisation and subscription tier
-    membership_result = await db.execute(
-        select(OrganisationMember)
-        .where(OrganisationMember.user_id == current_user.id)
-        .limit(1)
-    )
-    membership = membership_result.scalar_one_or_none()
+    org = await get_user_organisation_tier(db, current_user.id)
     
-    if not membership:
+    if not org:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User is not a member of any organisation"
         )
     
-    org_result = await db.execute(
-        select(Organisation).where(Organisation.id == membership.organisation_id)
-    )
-    org = org_result.scalar_one_or_none()
-    
-    user_tier = org.subscription_tier if org else "trial"
+    user_tier = org.subscription_tier
     
     # Check access
-    if not can_access_dashboard(user_tier, dashboard["tier_required"]):
+    if not is_dashboard_accessible(dashboard_id, user_tier):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"This dashboard requires {dashboard['tier_required']} subscription or higher. "
+            detail=f"This dashboard requires {dashboard.tier_required} subscription or higher. "
                    f"Your current tier: {user_tier}"
         )
     
     # Generate access URL based on dashboard type
     # In production, these would be real Streamlit/Tableau URLs
-    if dashboard["type"] == "streamlit":
+    if dashboard.type == "streamlit":
         # Streamlit Cloud or self-hosted URL
         base_url = "https://finsightai.streamlit.app"  # Update with your Streamlit URL
         access_url = f"{base_url}/{dashboard_id}?org={org.id}&user={current_user.id}"
@@ -340,8 +387,8 @@ async def get_dashboard_access(
     
     return {
         "dashboard_id": dashboard_id,
-        "dashboard_name": dashboard["name"],
-        "type": dashboard["type"],
+        "dashboard_name": dashboard.name,
+        "type": dashboard.type,
         "access_url": access_url,
         "organisation_id": str(org.id),
     }
@@ -356,36 +403,11 @@ async def get_dashboard_categories(
     Get dashboards organised by category.
     """
     # Get user's subscription tier
-    membership_result = await db.execute(
-        select(OrganisationMember)
-        .where(OrganisationMember.user_id == current_user.id)
-        .limit(1)
-    )
-    membership = membership_result.scalar_one_or_none()
-    
-    org_result = await db.execute(
-        select(Organisation).where(Organisation.id == membership.organisation_id)
-    ) if membership else None
-    org = org_result.scalar_one_or_none() if org_result else None
+    org = await get_user_organisation_tier(db, current_user.id)
     
     user_tier = org.subscription_tier if org else "trial"
     
-    # Organise by category
-    categories = {
-        "core": {"name": "Core Dashboards", "description": "Essential FP&A dashboards", "dashboards": []},
-        "advanced": {"name": "Advanced Analytics", "description": "Professional-tier analytics", "dashboards": []},
-        "enterprise": {"name": "Enterprise Features", "description": "Full platform capabilities", "dashboards": []},
-    }
-    
-    for dashboard_id, dashboard in DASHBOARDS.items():
-        category = dashboard.get("category", "core")
-        dashboard_info = {
-            **dashboard,
-            "accessible": can_access_dashboard(user_tier, dashboard["tier_required"]),
-        }
-        categories[category]["dashboards"].append(dashboard_info)
-    
-    return {
-        "current_tier": user_tier,
-        "categories": categories,
-    }
+    body = _CATEGORIES_BODIES.get(user_tier)
+    if body is None:
+        body = orjson.dumps(_categories_payload(user_tier))
+    return Response(content=body, media_type="application/json")
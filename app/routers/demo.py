@@ -4,16 +4,19 @@ FinSight AI - Demo Access Router
 API endpoints for email-gated demo access.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, func, or_, literal_column
+from sqlalchemy.dialects.postgresql import insert
 from datetime import datetime, timedelta, timezone
+from cachetools import TTLCache
 import uuid
 import secrets
 
 from app.core.database import get_db
 from app.core.config import settings
 from app.models.demo import DemoAccess, ContactInquiry
+from app.services.demo_views import queue_demo_view, flush_demo_views
 from app.schemas.demo import (
     DemoAccessRequest,
     DemoAccessResponse,
@@ -26,12 +29,34 @@ from app.schemas.demo import (
 
 router = APIRouter()
 
+# access_token -> (demo_access id, email, expires_at) for tokens seen valid.
+# A token is only replaced after it expires and hits are re-checked against
+# expires_at, so a hit can answer /verify-access without the database.
+_token_cache = TTLCache(maxsize=10_000, ttl=3600)
+
+# /stats is an aggregate over the whole table; a minute of staleness is fine
+_stats_cache = TTLCache(maxsize=1, ttl=60)
+
 
 def generate_access_token() -> str:
     """Generate a secure random access token."""
     return secrets.token_urlsafe(32)
 
 
+def cache_access_token(access) -> None:
+    """Remember a valid token for /verify-access (a DemoAccess or RETURNING row)."""
+    _token_cache[access.access_token] = (access.id, access.email, access.expires_at)
+
+
+def demo_view_values(now: datetime) -> dict:
+    """SET clause recording one demo view (safe under concurrent views)."""
+    return {
+        "demo_viewed": True,
+        "demo_viewed_at": func.coalesce(DemoAccess.demo_viewed_at, now),
+        "demo_view_count": DemoAccess.demo_view_count + 1,
+    }
+
+
 @router.post("/request-access", response_model=DemoAccessResponse)
 async def request_demo_access(
     data: DemoAccessRequest,
@@ -43,44 +68,14 @@ async def request_demo_access(
     This is the email-gated demo signup endpoint.
     Users must provide their email to access the demo.
     """
-    # Check if email already has access
-    result = await db.execute(
-        select(DemoAccess).where(DemoAccess.email == data.email)
-    )
-    existing = result.scalar_one_or_none()
-    
-    if existing:
-        # Return existing access if not expired
-        if not existing.is_expired:
-            demo_url = f"{settings.FRONTEND_URL}/demo?token={existing.access_token}"
-            return DemoAccessResponse(
-                success=True,
-                message="You already have demo access. Check your email for the link.",
-                access_token=existing.access_token,
-                demo_url=demo_url,
-                expires_at=existing.expires_at,
-            )
-        else:
-            # Refresh expired access
-            existing.access_token = generate_access_token()
-            existing.expires_at = datetime.now(timezone.utc) + timedelta(days=7)
-            existing.demo_viewed = False
-            await db.commit()
-            
-            demo_url = f"{settings.FRONTEND_URL}/demo?token={existing.access_token}"
-            return DemoAccessResponse(
-                success=True,
-                message="Your demo access has been refreshed.",
-                access_token=existing.access_token,
-                demo_url=demo_url,
-                expires_at=existing.expires_at,
-            )
-    
-    # Create new demo access
+    now = datetime.now(timezone.utc)
     access_token = generate_access_token()
-    expires_at = datetime.now(timezone.utc) + timedelta(days=7)  # 7 day access
+    expires_at = now + timedelta(days=7)  # 7 day access
     
-    new_access = DemoAccess(
+    # One statement for all three cases: insert a new signup, refresh an
+    # expired one, or (WHERE fails, nothing returned) leave a live one alone.
+    # Also closes the race where two requests both see no row and insert.
+    stmt = insert(DemoAccess).values(
         email=data.email,
         full_name=data.full_name,
         company_name=data.company_name,
@@ -98,12 +93,56 @@ async def request_demo_access(
         utm_campaign=data.utm_campaign,
         referrer=data.referrer,
     )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[func.lower(DemoAccess.email)],
+        set_={
+            "access_token": stmt.excluded.access_token,
+            "expires_at": stmt.excluded.expires_at,
+            "demo_viewed": False,
+        },
+        where=DemoAccess.expires_at < now,
+    ).returning(
+        DemoAccess.id,
+        DemoAccess.email,
+        DemoAccess.access_token,
+        DemoAccess.expires_at,
+        # xmax is 0 only on a freshly inserted row version
+        literal_column("xmax = 0").label("inserted"),
+    )
+    
+    result = await db.execute(stmt)
+    access = result.first()
+    
+    if access is None:
+        # Existing access that hasn't expired: hand back the same link
+        result = await db.execute(
+            select(DemoAccess).where(func.lower(DemoAccess.email) == data.email.lower())
+        )
+        existing = result.scalar_one()
+        cache_access_token(existing)
+        demo_url = f"{settings.FRONTEND_URL}/demo?token={existing.access_token}"
+        return DemoAccessResponse(
+            success=True,
+            message="You already have demo access. Check your email for the link.",
+            access_token=existing.access_token,
+            demo_url=demo_url,
+            expires_at=existing.expires_at,
+        )
     
-    db.add(new_access)
     await db.commit()
+    cache_access_token(access)
     
     # Build demo URL
-    demo_url = f"{settings.FRONTEND_URL}/demo?token={access_token}"
+    demo_url = f"{settings.FRONTEND_URL}/demo?token={access.access_token}"
+    
+    if not access.inserted:
+        return DemoAccessResponse(
+            success=True,
+            message="Your demo access has been refreshed.",
+            access_token=access.access_token,
+            demo_url=demo_url,
+            expires_at=access.expires_at,
+        )
     
     # TODO: Send confirmation email with demo link
     # For now, we just return the access token
@@ -111,15 +150,16 @@ async def request_demo_access(
     return DemoAccessResponse(
         success=True,
         message="Demo access granted! You can now view the demo.",
-        access_token=access_token,
+        access_token=access.access_token,
         demo_url=demo_url,
-        expires_at=expires_at,
+        expires_at=access.expires_at,
     )
 
 
 @router.post("/verify-access", response_model=DemoVerifyResponse)
 async def verify_demo_access(
     data: DemoVerifyRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -127,44 +167,68 @@ async def verify_demo_access(
     
     Called by the frontend to check if a token is valid before showing the demo.
     """
+    # Get the actual demo dashboard URL (Streamlit)
+    demo_dashboard_url = settings.DEMO_DASHBOARD_URL or f"{settings.FRONTEND_URL}/demo-dashboard"
+    now = datetime.now(timezone.utc)
+    
+    # Known-valid token: answer from the cache and queue the view for the next
+    # batched write. Per-request runtimes have no background flush loop, so
+    # they write it once the response has been sent.
+    cached = _token_cache.get(data.access_token)
+    if cached is not None:
+        demo_access_id, email, expires_at = cached
+        if expires_at is None or expires_at >= now:
+            queue_demo_view(demo_access_id, now)
+            if settings.SERVERLESS:
+                background_tasks.add_task(flush_demo_views)
+            return DemoVerifyResponse(
+                valid=True,
+                email=email,
+                demo_url=demo_dashboard_url,
+                message="Access verified. Welcome to the demo!"
+            )
+    
+    # Count the view in a single atomic UPDATE; concurrent views can't lose increments
     result = await db.execute(
-        select(DemoAccess).where(DemoAccess.access_token == data.access_token)
+        update(DemoAccess)
+        .where(
+            DemoAccess.token_lookup(data.access_token),
+            or_(DemoAccess.expires_at.is_(None), DemoAccess.expires_at >= now),
+        )
+        .values(**demo_view_values(now))
+        .returning(DemoAccess.id, DemoAccess.email, DemoAccess.expires_at)
+        .execution_options(synchronize_session=False)
     )
-    access = result.scalar_one_or_none()
+    row = result.first()
     
-    if not access:
-        return DemoVerifyResponse(
-            valid=False,
-            email=None,
-            demo_url=None,
-            message="Invalid access token. Please request demo access again."
+    if row is None:
+        # Unknown or expired token - look it up to tell the two apart
+        result = await db.execute(
+            select(DemoAccess.email).where(DemoAccess.token_lookup(data.access_token))
         )
-    
-    if access.is_expired:
+        expired_email = result.scalar_one_or_none()
+        
+        if expired_email is None:
+            return DemoVerifyResponse(
+                valid=False,
+                email=None,
+                demo_url=None,
+                message="Invalid access token. Please request demo access again."
+            )
+        
         return DemoVerifyResponse(
             valid=False,
-            email=access.email,
+            email=expired_email,
             demo_url=None,
             message="Your demo access has expired. Please request access again."
         )
     
-    # Mark as viewed
-    if not access.demo_viewed:
-        access.demo_viewed = True
-        access.demo_viewed_at = datetime.now(timezone.utc)
-    
-    # Increment view count
-    current_count = int(access.demo_view_count or "0")
-    access.demo_view_count = str(current_count + 1)
-    
     await db.commit()
-    
-    # Get the actual demo dashboard URL (Streamlit)
-    demo_dashboard_url = settings.DEMO_DASHBOARD_URL or f"{settings.FRONTEND_URL}/demo-dashboard"
+    _token_cache[data.access_token] = (row.id, row.email, row.expires_at)
     
     return DemoVerifyResponse(
         valid=True,
-        email=access.email,
+        email=row.email,
         demo_url=demo_dashboard_url,
         message="Access verified. Welcome to the demo!"
     )
@@ -177,35 +241,23 @@ async def get_demo_stats(db: AsyncSession = Depends(get_db)):
     
     Admin endpoint - should be protected in production.
     """
-    from sqlalchemy import func
-    
-    # Total signups
-    total_result = await db.execute(select(func.count(DemoAccess.id)))
-    total_signups = total_result.scalar()
-    
-    # Viewed demo
-    viewed_result = await db.execute(
-        select(func.count(DemoAccess.id))
-        .where(DemoAccess.demo_viewed == True)
-    )
-    viewed_count = viewed_result.scalar()
+    stats = _stats_cache.get("stats")
+    if stats is not None:
+        return stats
     
-    # Converted to trial
-    converted_result = await db.execute(
-        select(func.count(DemoAccess.id))
-        .where(DemoAccess.converted_to_trial == True)
-    )
-    converted_count = converted_result.scalar()
-    
-    # Signups today
+    # All four counts from one scan of demo_access
     today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-    today_result = await db.execute(
-        select(func.count(DemoAccess.id))
-        .where(DemoAccess.created_at >= today_start)
+    result = await db.execute(
+        select(
+            func.count(DemoAccess.id),
+            func.count(DemoAccess.id).filter(DemoAccess.demo_viewed == True),
+            func.count(DemoAccess.id).filter(DemoAccess.converted_to_trial == True),
+            func.count(DemoAccess.id).filter(DemoAccess.created_at >= today_start),
+        )
     )
-    today_signups = today_result.scalar()
+    total_signups, viewed_count, converted_count, today_signups = result.one()
     
-    return {
+    stats = {
         "total_signups": total_signups,
         "demo_viewed": viewed_count,
         "converted_to_trial": converted_count,
@@ -213,6 +265,8 @@ async def get_demo_stats(db: AsyncSession = Depends(get_db)):
         "view_rate": f"{(viewed_count / total_signups * 100) if total_signups > 0 else 0:.1f}%",
         "conversion_rate": f"{(converted_count / total_signups * 100) if total_signups > 0 else 0:.1f}%",
     }
+    _stats_cache["stats"] = stats
+    return stats
 
 
 @router.post("/contact", response_model=ContactInquiryResponse)
@@ -238,7 +292,6 @@ async def submit_contact_inquiry(
     
     db.add(new_inquiry)
     await db.commit()
-    await db.refresh(new_inquiry)
     
     # TODO: Send notification email to hello@finsightai.tech
     # TODO: Send confirmation email to the user
@@ -6,11 +6,12 @@ API endpoints for organisation management (multi-tenant).
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, exists
+from sqlalchemy.orm import aliased, contains_eager
 from typing import List
 
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, clear_tier_cache
 from app.models.user import User
 from app.models.organisation import Organisation, OrganisationMember, MemberRole
 from app.models.data_source import DataSource
@@ -34,13 +35,68 @@ import re
 
 router = APIRouter()
 
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
 
 def generate_slug(name: str) -> str:
     """Generate a URL-friendly slug from a name."""
-    slug = name.lower()
-    slug = re.sub(r'[^a-z0-9]+', '-', slug)
-    slug = slug.strip('-')
-    return f"{slug}-{str(uuid.uuid4())[:8]}"
+    slug = _SLUG_RE.sub('-', name.lower()).strip('-')
+    return f"{slug}-{uuid.uuid4().hex[:8]}"
+
+
+async def get_member_organisation(db: AsyncSession, org_id: str, user_id: uuid.UUID, *columns):
+    """
+    Return a (Organisation, role, *columns) row if the user is a member of
+    the organisation, else None. One joined query for check and fetch; extra
+    columns (e.g. labelled scalar subqueries) ride along in the same query.
+    """
+    result = await db.execute(
+        select(Organisation, OrganisationMember.role, *columns)
+        .join(OrganisationMember, OrganisationMember.organisation_id == Organisation.id)
+        .where(Organisation.id == org_id)
+        .where(OrganisationMember.user_id == user_id)
+    )
+    return result.first()
+
+
+async def get_membership(
+    org_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Dependency: the caller's (Organisation, role) row for the org_id path
+    parameter. Raises 404 if they are not a member.
+    """
+    row = await get_member_organisation(db, org_id, current_user.id)
+    
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Organisation not found"
+        )
+    
+    return row
+
+
+async def get_admin_membership(
+    org_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Dependency: like get_membership, but the caller must be an owner or
+    admin. Raises 403 otherwise.
+    """
+    row = await get_member_organisation(db, org_id, current_user.id)
+    
+    if not row or row.role not in [MemberRole.OWNER.value, MemberRole.ADMIN.value]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to update this organisation"
+        )
+    
+    return row
 
 
 @router.get("/", response_model=List[OrganisationResponse])
@@ -90,8 +146,8 @@ async def create_organisation(
     slug = org_data.slug or generate_slug(org_data.name)
     
     # Check if slug is unique
-    result = await db.execute(select(Organisation).where(Organisation.slug == slug))
-    if result.scalar_one_or_none():
+    slug_taken = await db.scalar(select(exists().where(Organisation.slug == slug)))
+    if slug_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="An organisation with this slug already exists"
@@ -121,7 +177,7 @@ async def create_organisation(
     
     db.add(membership)
     await db.commit()
-    await db.refresh(new_org)
+    clear_tier_cache(current_user.id)
     
     return OrganisationResponse(
         id=str(new_org.id),
@@ -148,45 +204,34 @@ async def get_organisation(
     
     User must be a member of the organisation.
     """
-    # Verify user is a member
-    membership_result = await db.execute(
-        select(OrganisationMember)
-        .where(OrganisationMember.organisation_id == org_id)
-        .where(OrganisationMember.user_id == current_user.id)
+    # Counts as scalar subqueries, fetched with the organisation and the
+    # membership check in a single round trip. The alias keeps the member
+    # count from correlating to the membership join.
+    members = aliased(OrganisationMember)
+    member_count = (
+        select(func.count(members.id))
+        .where(members.organisation_id == Organisation.id)
+        .scalar_subquery()
+        .label("member_count")
+    )
+    data_source_count = (
+        select(func.count(DataSource.id))
+        .where(DataSource.organisation_id == Organisation.id)
+        .scalar_subquery()
+        .label("data_source_count")
     )
-    membership = membership_result.scalar_one_or_none()
-    
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Organisation not found"
-        )
     
-    # Get organisation
-    org_result = await db.execute(
-        select(Organisation).where(Organisation.id == org_id)
+    row = await get_member_organisation(
+        db, org_id, current_user.id, member_count, data_source_count
     )
-    org = org_result.scalar_one_or_none()
     
-    if not org:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Organisation not found"
         )
     
-    # Get member count
-    member_count_result = await db.execute(
-        select(func.count(OrganisationMember.id))
-        .where(OrganisationMember.organisation_id == org_id)
-    )
-    member_count = member_count_result.scalar()
-    
-    # Get data source count
-    ds_count_result = await db.execute(
-        select(func.count(DataSource.id))
-        .where(DataSource.organisation_id == org_id)
-    )
-    data_source_count = ds_count_result.scalar()
+    org = row.Organisation
     
     return OrganisationDetailResponse(
         id=str(org.id),
@@ -200,16 +245,15 @@ async def get_organisation(
         trial_ends_at=org.trial_ends_at,
         created_at=org.created_at,
         billing_email=org.billing_email,
-        member_count=member_count,
-        data_source_count=data_source_count,
+        member_count=row.member_count,
+        data_source_count=row.data_source_count,
     )
 
 
 @router.patch("/{org_id}", response_model=OrganisationResponse)
 async def update_organisation(
-    org_id: str,
     updates: OrganisationUpdate,
-    current_user: User = Depends(get_current_user),
+    membership = Depends(get_admin_membership),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -217,31 +261,7 @@ async def update_organisation(
     
     Only admins and owners can update.
     """
-    # Verify user is admin or owner
-    membership_result = await db.execute(
-        select(OrganisationMember)
-        .where(OrganisationMember.organisation_id == org_id)
-        .where(OrganisationMember.user_id == current_user.id)
-    )
-    membership = membership_result.scalar_one_or_none()
-    
-    if not membership or membership.role not in [MemberRole.OWNER.value, MemberRole.ADMIN.value]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to update this organisation"
-        )
-    
-    # Get organisation
-    org_result = await db.execute(
-        select(Organisation).where(Organisation.id == org_id)
-    )
-    org = org_result.scalar_one_or_none()
-    
-    if not org:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Organisation not found"
-        )
+    org = membership.Organisation
     
     # Apply updates
     if updates.name is not None:
@@ -283,36 +303,37 @@ async def list_organisation_members(
     """
     List all members of an organisation.
     """
-    # Verify user is a member
-    membership_result = await db.execute(
-        select(OrganisationMember)
+    # Get all members with user info, only if the current user is one of them
+    caller_is_member = (
+        select(OrganisationMember.id)
         .where(OrganisationMember.organisation_id == org_id)
         .where(OrganisationMember.user_id == current_user.id)
+        .exists()
+    )
+    members_result = await db.execute(
+        select(OrganisationMember)
+        .join(User, OrganisationMember.user_id == User.id)
+        .options(contains_eager(OrganisationMember.user))
+        .where(OrganisationMember.organisation_id == org_id)
+        .where(caller_is_member)
     )
-    membership = membership_result.scalar_one_or_none()
+    members = members_result.scalars().all()
     
-    if not membership:
+    # A member always sees at least themselves
+    if not members:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Organisation not found"
         )
     
-    # Get all members with user info
-    members_result = await db.execute(
-        select(OrganisationMember, User)
-        .join(User, OrganisationMember.user_id == User.id)
-        .where(OrganisationMember.organisation_id == org_id)
-    )
-    members = members_result.all()
-    
     return [
         MemberResponse(
-            id=str(m.OrganisationMember.id),
-            user_id=str(m.User.id),
-            email=m.User.email,
-            full_name=m.User.full_name,
-            role=m.OrganisationMember.role,
-            joined_at=m.OrganisationMember.joined_at,
+            id=str(m.id),
+            user_id=str(m.user.id),
+            email=m.user.email,
+            full_name=m.user.full_name,
+            role=m.role,
+            joined_at=m.joined_at,
         )
         for m in members
     ]
@@ -320,38 +341,12 @@ async def list_organisation_members(
 
 @router.get("/{org_id}/subscription", response_model=SubscriptionInfo)
 async def get_subscription_info(
-    org_id: str,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    membership = Depends(get_membership),
 ):
     """
     Get subscription information for an organisation.
     """
-    # Verify user is a member
-    membership_result = await db.execute(
-        select(OrganisationMember)
-        .where(OrganisationMember.organisation_id == org_id)
-        .where(OrganisationMember.user_id == current_user.id)
-    )
-    membership = membership_result.scalar_one_or_none()
-    
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Organisation not found"
-        )
-    
-    # Get organisation
-    org_result = await db.execute(
-        select(Organisation).where(Organisation.id == org_id)
-    )
-    org = org_result.scalar_one_or_none()
-    
-    if not org:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Organisation not found"
-        )
+    org = membership.Organisation
     
     # Get tier features
     tier = SubscriptionTierEnum(org.subscription_tier)
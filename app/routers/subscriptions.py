@@ -4,17 +4,26 @@ FinSight AI - Subscriptions Router
 API endpoints for subscription management (Stripe integration).
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, BackgroundTasks
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import joinedload, raiseload
+from datetime import datetime, timedelta, timezone
 from typing import Optional
+import asyncio
+import logging
+import orjson
 import stripe
 
-from app.core.database import get_db
+from app.core.database import get_db, AsyncSessionLocal, engine
 from app.core.config import settings
-from app.core.security import get_current_user
+from app.core.security import get_current_user, clear_tier_cache
 from app.models.user import User
 from app.models.organisation import Organisation, OrganisationMember, MemberRole
+from app.models.stripe_event import StripeEvent
 from app.schemas.organisation import (
     SubscriptionInfo,
     SubscriptionTierEnum,
@@ -23,6 +32,8 @@ from app.schemas.organisation import (
 )
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 # Initialise Stripe
@@ -37,6 +48,18 @@ STRIPE_PRICES = {
     "enterprise": settings.STRIPE_PRICE_ENTERPRISE,
 }
 
+# Failed attempts after which a webhook event is left for manual follow-up
+STRIPE_EVENT_MAX_ATTEMPTS = 5
+
+# A claim older than this is assumed abandoned (the worker died mid-event)
+STRIPE_EVENT_CLAIM_TIMEOUT = timedelta(minutes=5)
+
+# Seconds between sweeps for unapplied webhook events
+STRIPE_RETRY_INTERVAL_SECONDS = 300
+
+# pg_try_advisory_lock key: one sweep at a time across workers and instances
+_STRIPE_SWEEP_LOCK = 0x5EED_57E1
+
 TIER_PRICES_GBP = {
     "essentials": 500,
     "professional": 1500,
@@ -44,11 +67,8 @@ TIER_PRICES_GBP = {
 }
 
 
-@router.get("/plans")
-async def list_subscription_plans():
-    """
-    List available subscription plans with pricing.
-    """
+def _build_plans() -> list:
+    """Plan listing; depends only on the pricing tables and settings."""
     plans = []
     
     for tier, price in TIER_PRICES_GBP.items():
@@ -59,13 +79,25 @@ async def list_subscription_plans():
             "tier": tier,
             "name": tier.title(),
             "price_monthly_gbp": price,
-            "features": tier_info.get("features", []),
-            "limits": tier_info.get("limits", {}),
+            "features": list(tier_info.get("features", ())),
+            "limits": tier_info["limits"].model_dump() if tier_info else {},
             "stripe_price_id": STRIPE_PRICES.get(tier),
             "popular": tier == "professional",  # Mark Professional as popular
         })
     
-    return {"plans": plans}
+    return plans
+
+
+# Fixed for the life of the process: serialise the /plans body once
+_PLANS_BODY = orjson.dumps({"plans": _build_plans()})
+
+
+@router.get("/plans")
+async def list_subscription_plans():
+    """
+    List available subscription plans with pricing.
+    """
+    return Response(content=_PLANS_BODY, media_type="application/json")
 
 
 @router.post("/create-checkout-session")
@@ -97,9 +129,11 @@ async def create_checkout_session(
             detail=f"Stripe price not configured for tier: {tier}"
         )
     
-    # Get user's organisation
+    # Get user's organisation (joined onto the membership row, one query).
+    # Any other relationship access raises instead of lazy loading.
     membership_result = await db.execute(
         select(OrganisationMember)
+        .options(joinedload(OrganisationMember.organisation).raiseload("*"), raiseload("*"))
         .where(OrganisationMember.user_id == current_user.id)
         .where(OrganisationMember.role.in_([MemberRole.OWNER.value, MemberRole.ADMIN.value]))
         .limit(1)
@@ -112,11 +146,7 @@ async def create_checkout_session(
             detail="You must be an organisation owner or admin to manage subscriptions"
         )
     
-    # Get organisation
-    org_result = await db.execute(
-        select(Organisation).where(Organisation.id == membership.organisation_id)
-    )
-    org = org_result.scalar_one_or_none()
+    org = membership.organisation
     
     if not org:
         raise HTTPException(
@@ -124,12 +154,19 @@ async def create_checkout_session(
             detail="Organisation not found"
         )
     
+    # Hand the connection back to the pool before the Stripe round trips;
+    # the loaded organisation stays readable once detached
+    await db.close()
+    
+    # stripe-python's calls are blocking HTTP requests, so they run in the
+    # threadpool rather than on the event loop
     try:
         # Get or create Stripe customer
         if org.stripe_customer_id:
             customer_id = org.stripe_customer_id
         else:
-            customer = stripe.Customer.create(
+            customer = await run_in_threadpool(
+                stripe.Customer.create,
                 email=current_user.email,
                 name=org.name,
                 metadata={
@@ -138,11 +175,18 @@ async def create_checkout_session(
                 }
             )
             customer_id = customer.id
-            org.stripe_customer_id = customer_id
+            # Short second transaction; the session checks out a connection again
+            await db.execute(
+                update(Organisation)
+                .where(Organisation.id == org.id)
+                .where(Organisation.stripe_customer_id.is_(None))
+                .values(stripe_customer_id=customer_id)
+            )
             await db.commit()
         
         # Create Checkout session
-        checkout_session = stripe.checkout.Session.create(
+        checkout_session = await run_in_threadpool(
+            stripe.checkout.Session.create,
             customer=customer_id,
             payment_method_types=["card"],
             line_items=[
@@ -193,9 +237,11 @@ async def create_portal_session(
             detail="Payment processing is not configured"
         )
     
-    # Get user's organisation
+    # Get user's organisation (joined onto the membership row, one query).
+    # Any other relationship access raises instead of lazy loading.
     membership_result = await db.execute(
         select(OrganisationMember)
+        .options(joinedload(OrganisationMember.organisation).raiseload("*"), raiseload("*"))
         .where(OrganisationMember.user_id == current_user.id)
         .where(OrganisationMember.role.in_([MemberRole.OWNER.value, MemberRole.ADMIN.value]))
         .limit(1)
@@ -208,11 +254,7 @@ async def create_portal_session(
             detail="You must be an organisation owner or admin to manage subscriptions"
         )
     
-    # Get organisation
-    org_result = await db.execute(
-        select(Organisation).where(Organisation.id == membership.organisation_id)
-    )
-    org = org_result.scalar_one_or_none()
+    org = membership.organisation
     
     if not org or not org.stripe_customer_id:
         raise HTTPException(
@@ -220,8 +262,12 @@ async def create_portal_session(
             detail="No subscription found. Please subscribe first."
         )
     
+    # Nothing more to read or write: release the connection before calling Stripe
+    await db.close()
+    
     try:
-        portal_session = stripe.billing_portal.Session.create(
+        portal_session = await run_in_threadpool(
+            stripe.billing_portal.Session.create,
             customer=org.stripe_customer_id,
             return_url=f"{settings.FRONTEND_URL}/dashboard/settings",
         )
@@ -238,12 +284,16 @@ async def create_portal_session(
 @router.post("/webhook")
 async def stripe_webhook(
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Handle Stripe webhook events.
     
     This endpoint receives events from Stripe (subscription created, updated, cancelled, etc.)
+    Once the signature checks out the event is recorded in stripe_events and
+    acknowledged, then applied in a background task. If the record can't be
+    written the request fails and Stripe redelivers.
     """
     if not settings.STRIPE_WEBHOOK_SECRET:
         raise HTTPException(
@@ -254,8 +304,10 @@ async def stripe_webhook(
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature")
     
+    # Signature check (HMAC over the whole payload) runs in the threadpool
     try:
-        event = stripe.Webhook.construct_event(
+        await run_in_threadpool(
+            stripe.Webhook.construct_event,
             payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
         )
     except ValueError as e:
@@ -263,26 +315,190 @@ async def stripe_webhook(
     except stripe.error.SignatureVerificationError as e:
         raise HTTPException(status_code=400, detail="Invalid signature")
     
-    # Handle the event
-    if event["type"] == "checkout.session.completed":
-        session = event["data"]["object"]
-        await handle_checkout_completed(session, db)
+    # Plain dict for the JSONB column and the handlers
+    event = orjson.loads(payload)
     
-    elif event["type"] == "customer.subscription.updated":
-        subscription = event["data"]["object"]
-        await handle_subscription_updated(subscription, db)
-    
-    elif event["type"] == "customer.subscription.deleted":
-        subscription = event["data"]["object"]
-        await handle_subscription_deleted(subscription, db)
+    # Stripe redelivers on timeouts and errors; the event id primary key
+    # makes sure each event is recorded (and applied) once
+    result = await db.execute(
+        insert(StripeEvent)
+        .values(
+            event_id=event["id"],
+            type=event["type"],
+            payload=event,
+            subscription_id=_event_subscription_id(event),
+            event_created_at=_event_created_at(event),
+        )
+        .on_conflict_do_nothing(index_elements=[StripeEvent.event_id])
+        .returning(StripeEvent.event_id)
+    )
+    if result.scalar_one_or_none() is None:
+        processed_at = await db.scalar(
+            select(StripeEvent.processed_at).where(StripeEvent.event_id == event["id"])
+        )
+        if processed_at is not None:
+            return {"status": "duplicate"}
+        # Recorded earlier but not applied yet. If it is still being applied
+        # the claim in process_stripe_event() fails and this is a no-op.
+    else:
+        await db.commit()
     
-    elif event["type"] == "invoice.payment_failed":
-        invoice = event["data"]["object"]
-        await handle_payment_failed(invoice, db)
+    background_tasks.add_task(process_stripe_event, event)
     
     return {"status": "success"}
 
 
+def _event_subscription_id(event: dict) -> Optional[str]:
+    """The subscription (or, failing that, customer) an event is about."""
+    obj = event["data"]["object"]
+    if event["type"].startswith("customer.subscription."):
+        return obj.get("id")
+    return obj.get("subscription") or obj.get("customer")
+
+
+def _event_created_at(event: dict) -> Optional[datetime]:
+    """When Stripe created the event (its "created" Unix timestamp)."""
+    created = event.get("created")
+    return datetime.fromtimestamp(created, timezone.utc) if created else None
+
+
+async def _is_superseded(event: dict, db: AsyncSession) -> bool:
+    """Whether a newer event for the same subscription has already been applied."""
+    subscription_id = _event_subscription_id(event)
+    created_at = _event_created_at(event)
+    if subscription_id is None or created_at is None:
+        return False
+    
+    return bool(await db.scalar(
+        select(StripeEvent.event_id)
+        .where(StripeEvent.subscription_id == subscription_id)
+        .where(StripeEvent.event_created_at > created_at)
+        .where(StripeEvent.processed_at.is_not(None))
+        .limit(1)
+    ))
+
+
+async def _claim_stripe_event(event_id: str, db: AsyncSession) -> bool:
+    """
+    Claim an unapplied event for this task. Fails if it is already applied,
+    out of attempts, or claimed by another task within the claim timeout.
+    """
+    now = datetime.now(timezone.utc)
+    claimed = await db.scalar(
+        update(StripeEvent)
+        .where(StripeEvent.event_id == event_id)
+        .where(StripeEvent.processed_at.is_(None))
+        .where(StripeEvent.attempts < STRIPE_EVENT_MAX_ATTEMPTS)
+        .where(or_(
+            StripeEvent.processing_started_at.is_(None),
+            StripeEvent.processing_started_at < now - STRIPE_EVENT_CLAIM_TIMEOUT,
+        ))
+        .values(processing_started_at=now)
+        .returning(StripeEvent.event_id)
+    )
+    await db.commit()
+    return claimed is not None
+
+
+async def process_stripe_event(event: dict) -> None:
+    """
+    Apply a recorded webhook event in its own session (runs after the
+    response) and mark it processed. Does nothing unless the event can be
+    claimed (see _claim_stripe_event). Events older than one already applied
+    to the same subscription are marked processed without being applied.
+    On failure the attempt and error are recorded and the event stays
+    pending for process_pending_stripe_events().
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            if not await _claim_stripe_event(event["id"], db):
+                return
+            
+            try:
+                if await _is_superseded(event, db):
+                    logger.info(f"Skipping superseded Stripe event {event['id']} ({event['type']})")
+                
+                # Handle the event
+                elif event["type"] == "checkout.session.completed":
+                    session = event["data"]["object"]
+                    await handle_checkout_completed(session, db)
+                
+                elif event["type"] == "customer.subscription.updated":
+                    subscription = event["data"]["object"]
+                    await handle_subscription_updated(subscription, db)
+                
+                elif event["type"] == "customer.subscription.deleted":
+                    subscription = event["data"]["object"]
+                    await handle_subscription_deleted(subscription, db)
+                
+                elif event["type"] == "invoice.payment_failed":
+                    invoice = event["data"]["object"]
+                    await handle_payment_failed(invoice, db)
+            except Exception as e:
+                await db.rollback()
+                await db.execute(
+                    update(StripeEvent)
+                    .where(StripeEvent.event_id == event["id"])
+                    .values(
+                        attempts=StripeEvent.attempts + 1,
+                        last_error=str(e)[:2000],
+                        processing_started_at=None,
+                    )
+                )
+                await db.commit()
+                raise
+            
+            await db.execute(
+                update(StripeEvent)
+                .where(StripeEvent.event_id == event["id"])
+                .values(processed_at=func.now())
+            )
+            await db.commit()
+    except Exception as e:
+        # Already acknowledged: left pending for the retry sweep
+        logger.error(f"✗ Failed to process Stripe event {event.get('id')} ({event.get('type')}): {str(e)}")
+
+
+async def process_pending_stripe_events(limit: int = 100) -> int:
+    """
+    Retry events that were recorded but never applied (the background task
+    failed, or the worker stopped first), oldest first, skipping ones that
+    have used up their attempts. An advisory lock keeps this to one sweep
+    at a time across all workers; returns how many events were attempted.
+    """
+    async with engine.connect() as lock_conn:
+        if not await lock_conn.scalar(select(func.pg_try_advisory_lock(_STRIPE_SWEEP_LOCK))):
+            return 0
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(StripeEvent.payload)
+                    .where(StripeEvent.processed_at.is_(None))
+                    .where(StripeEvent.attempts < STRIPE_EVENT_MAX_ATTEMPTS)
+                    .order_by(StripeEvent.received_at)
+                    .limit(limit)
+                )
+                events = result.scalars().all()
+            
+            for event in events:
+                await process_stripe_event(event)
+            return len(events)
+        finally:
+            await lock_conn.scalar(select(func.pg_advisory_unlock(_STRIPE_SWEEP_LOCK)))
+
+
+async def process_pending_stripe_events_periodically() -> None:
+    """Background loop started from the app lifespan; cancel it to stop."""
+    while True:
+        await asyncio.sleep(STRIPE_RETRY_INTERVAL_SECONDS)
+        try:
+            retried = await process_pending_stripe_events()
+            if retried:
+                logger.info(f"✓ Retried {retried} pending Stripe event(s)")
+        except Exception as e:
+            logger.warning(f"⚠ Could not retry pending Stripe events: {str(e)}")
+
+
 async def handle_checkout_completed(session: dict, db: AsyncSession):
     """Handle successful checkout."""
     org_id = session.get("metadata", {}).get("organisation_id")
@@ -303,6 +519,7 @@ async def handle_checkout_completed(session: dict, db: AsyncSession):
         org.stripe_subscription_id = subscription_id
         org.trial_ends_at = None
         await db.commit()
+        clear_tier_cache()
 
 
 async def handle_subscription_updated(subscription: dict, db: AsyncSession):
@@ -324,6 +541,7 @@ async def handle_subscription_updated(subscription: dict, db: AsyncSession):
             org.subscription_tier = tier
         org.subscription_status = status
         await db.commit()
+        clear_tier_cache()
 
 
 async def handle_subscription_deleted(subscription: dict, db: AsyncSession):
@@ -5,33 +5,37 @@ API endpoints for user profile management.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
+from cachetools import TTLCache
+import orjson
 
 from app.core.database import get_db
-from app.core.security import get_current_user, get_password_hash, verify_password
+from app.core.security import get_current_user, get_password_hash_async, verify_password_async
 from app.models.user import User
 from app.schemas.auth import UserResponse, UserUpdate, PasswordChange
 
 
 router = APIRouter()
 
+# (user id, updated_at) -> serialised /me body. Any write to the user row
+# bumps updated_at, so a changed profile never matches a stale entry and no
+# explicit invalidation is needed. Keyed per user: never shared across users.
+_profile_cache = TTLCache(maxsize=10_000, ttl=60)
+
 
 @router.get("/me", response_model=UserResponse)
 async def get_my_profile(current_user: User = Depends(get_current_user)):
     """
     Get current user's profile.
     """
-    return UserResponse(
-        id=str(current_user.id),
-        email=current_user.email,
-        full_name=current_user.full_name,
-        job_title=current_user.job_title,
-        is_active=current_user.is_active,
-        is_verified=current_user.is_verified,
-        created_at=current_user.created_at,
-        last_login_at=current_user.last_login_at,
-    )
+    key = (current_user.id, current_user.updated_at)
+    body = _profile_cache.get(key)
+    if body is None:
+        body = orjson.dumps(UserResponse.model_validate(current_user).model_dump(mode="json"))
+        _profile_cache[key] = body
+    return Response(content=body, media_type="application/json")
 
 
 @router.patch("/me", response_model=UserResponse)
@@ -43,27 +47,18 @@ async def update_my_profile(
     """
     Update current user's profile.
     """
-    # Apply updates
-    if updates.full_name is not None:
-        current_user.full_name = updates.full_name
-    if updates.job_title is not None:
-        current_user.job_title = updates.job_title
-    if updates.phone is not None:
-        current_user.phone = updates.phone
+    # Apply the fields the client sent (explicit nulls are ignored); only
+    # write if something actually changed
+    dirty = False
+    for field, value in updates.model_dump(exclude_unset=True, exclude_none=True).items():
+        if getattr(current_user, field) != value:
+            setattr(current_user, field, value)
+            dirty = True
     
-    await db.commit()
-    await db.refresh(current_user)
+    if dirty:
+        await db.commit()
     
-    return UserResponse(
-        id=str(current_user.id),
-        email=current_user.email,
-        full_name=current_user.full_name,
-        job_title=current_user.job_title,
-        is_active=current_user.is_active,
-        is_verified=current_user.is_verified,
-        created_at=current_user.created_at,
-        last_login_at=current_user.last_login_at,
-    )
+    return UserResponse.model_validate(current_user)
 
 
 @router.post("/me/change-password")
@@ -75,15 +70,27 @@ async def change_password(
     """
     Change current user's password.
     """
-    # Verify current password
-    if not verify_password(data.current_password, current_user.hashed_password):
+    # hashed_password is deferred on User: select just that column
+    current_hash = await db.scalar(
+        select(User.hashed_password).where(User.id == current_user.id)
+    )
+    
+    # Verify current password. passlib's bcrypt verify compares digests in
+    # constant time (like hmac.compare_digest); don't add cheap pre-checks
+    # (length, prefix) in front of it, they would leak timing.
+    if not await verify_password_async(data.current_password, current_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
-    # Update password
-    current_user.hashed_password = get_password_hash(data.new_password)
+    # Update password (one targeted UPDATE, no unit-of-work flush)
+    hashed_password = await get_password_hash_async(data.new_password)
+    await db.execute(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(hashed_password=hashed_password)
+    )
     await db.commit()
     
     return {"message": "Password changed successfully"}
@@ -101,7 +108,11 @@ async def delete_my_account(
     If the user is the sole owner of an organisation, the org will be orphaned.
     """
     # Soft delete - just deactivate
-    current_user.is_active = False
+    await db.execute(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(is_active=False)
+    )
     await db.commit()
     
     return {"message": "Account has been deactivated"}
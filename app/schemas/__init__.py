@@ -2,76 +2,57 @@
 FinSight AI - Pydantic Schemas
 ==============================
 Export all schemas.
-"""
-
-from app.schemas.auth import (
-    UserRegister,
-    UserLogin,
-    TokenResponse,
-    TokenRefresh,
-    PasswordReset,
-    PasswordResetConfirm,
-    PasswordChange,
-    UserResponse,
-    UserUpdate,
-)
 
-from app.schemas.organisation import (
-    OrganisationCreate,
-    OrganisationUpdate,
-    OrganisationResponse,
-    OrganisationDetailResponse,
-    MemberInvite,
-    MemberResponse,
-    MemberRoleUpdate,
-    SubscriptionInfo,
-    SubscriptionTierEnum,
-    SubscriptionStatusEnum,
-    MemberRoleEnum,
-    TIER_FEATURES,
-)
-
-from app.schemas.demo import (
-    DemoAccessRequest,
-    DemoAccessResponse,
-    DemoVerifyRequest,
-    DemoVerifyResponse,
-    ContactInquiryRequest,
-    ContactInquiryResponse,
-)
+Schemas are imported on first attribute access (PEP 562), so importing one
+schema module does not build every other module's validators.
+"""
 
+import importlib
 
-__all__ = [
+# Exported name -> module that defines it
+_EXPORTS = {
     # Auth
-    "UserRegister",
-    "UserLogin",
-    "TokenResponse",
-    "TokenRefresh",
-    "PasswordReset",
-    "PasswordResetConfirm",
-    "PasswordChange",
-    "UserResponse",
-    "UserUpdate",
+    "UserRegister": "app.schemas.auth",
+    "UserLogin": "app.schemas.auth",
+    "TokenResponse": "app.schemas.auth",
+    "TokenRefresh": "app.schemas.auth",
+    "PasswordReset": "app.schemas.auth",
+    "PasswordResetConfirm": "app.schemas.auth",
+    "PasswordChange": "app.schemas.auth",
+    "UserResponse": "app.schemas.auth",
+    "UserUpdate": "app.schemas.auth",
     
     # Organisation
-    "OrganisationCreate",
-    "OrganisationUpdate",
-    "OrganisationResponse",
-    "OrganisationDetailResponse",
-    "MemberInvite",
-    "MemberResponse",
-    "MemberRoleUpdate",
-    "SubscriptionInfo",
-    "SubscriptionTierEnum",
-    "SubscriptionStatusEnum",
-    "MemberRoleEnum",
-    "TIER_FEATURES",
+    "OrganisationCreate": "app.schemas.organisation",
+    "OrganisationUpdate": "app.schemas.organisation",
+    "OrganisationResponse": "app.schemas.organisation",
+    "OrganisationDetailResponse": "app.schemas.organisation",
+    "MemberInvite": "app.schemas.organisation",
+    "MemberResponse": "app.schemas.organisation",
+    "MemberRoleUpdate": "app.schemas.organisation",
+    "SubscriptionInfo": "app.schemas.organisation",
+    "SubscriptionLimits": "app.schemas.organisation",
+    "SubscriptionTierEnum": "app.schemas.organisation",
+    "SubscriptionStatusEnum": "app.schemas.organisation",
+    "MemberRoleEnum": "app.schemas.organisation",
+    "MemberRoleField": "app.schemas.organisation",
+    "TIER_FEATURES": "app.schemas.organisation",
     
     # Demo
-    "DemoAccessRequest",
-    "DemoAccessResponse",
-    "DemoVerifyRequest",
-    "DemoVerifyResponse",
-    "ContactInquiryRequest",
-    "ContactInquiryResponse",
-]
+    "DemoAccessRequest": "app.schemas.demo",
+    "DemoAccessResponse": "app.schemas.demo",
+    "DemoVerifyRequest": "app.schemas.demo",
+    "DemoVerifyResponse": "app.schemas.demo",
+    "ContactInquiryRequest": "app.schemas.demo",
+    "ContactInquiryResponse": "app.schemas.demo",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,41 +4,62 @@ FinSight AI - Authentication Schemas
 Pydantic models for auth request/response validation.
 """
 
-from pydantic import BaseModel, EmailStr, Field, field_validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, AfterValidator
+from typing import Annotated, Optional
 from datetime import datetime
-import re
+from uuid import UUID
+import string
+
+from app.schemas.fields import Email
+
+
+# Password rules are tested against the set of characters in the password,
+# built in one pass, rather than searching the string once per rule
+_UPPERCASE = frozenset(string.ascii_uppercase)
+_LOWERCASE = frozenset(string.ascii_lowercase)
+_DIGITS = frozenset(string.digits)
+
+
+def _validate_password_strength(v: str) -> str:
+    """Shared password rules: at least one uppercase, lowercase and digit."""
+    chars = set(v)
+    if _UPPERCASE.isdisjoint(chars):
+        raise ValueError('Password must contain at least one uppercase letter')
+    if _LOWERCASE.isdisjoint(chars):
+        raise ValueError('Password must contain at least one lowercase letter')
+    # Non-ASCII decimal digits count too, as they did with regex \d
+    if _DIGITS.isdisjoint(chars) and not any(c.isdecimal() for c in chars):
+        raise ValueError('Password must contain at least one digit')
+    return v
+
+
+# Length limits and strength rules for any new password, declared once
+StrongPassword = Annotated[
+    str,
+    Field(min_length=8, max_length=100),
+    AfterValidator(_validate_password_strength),
+]
 
 
 class UserRegister(BaseModel):
     """Schema for user registration."""
-    email: EmailStr
-    password: str = Field(..., min_length=8, max_length=100)
+    email: Email
+    password: StrongPassword
     full_name: str = Field(..., min_length=2, max_length=255)
     company_name: Optional[str] = Field(None, max_length=255)
     job_title: Optional[str] = Field(None, max_length=255)
-    
-    @field_validator('password')
-    @classmethod
-    def password_strength(cls, v: str) -> str:
-        """Validate password strength."""
-        if not re.search(r'[A-Z]', v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        if not re.search(r'[a-z]', v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        if not re.search(r'\d', v):
-            raise ValueError('Password must contain at least one digit')
-        return v
 
 
 class UserLogin(BaseModel):
     """Schema for user login."""
-    email: EmailStr
+    email: Email
     password: str
 
 
 class TokenResponse(BaseModel):
     """Schema for token response."""
+    model_config = ConfigDict(frozen=True)
+    
     access_token: str
     refresh_token: str
     token_type: str = "bearer"
@@ -52,48 +73,24 @@ class TokenRefresh(BaseModel):
 
 class PasswordReset(BaseModel):
     """Schema for password reset request."""
-    email: EmailStr
+    email: Email
 
 
 class PasswordResetConfirm(BaseModel):
     """Schema for password reset confirmation."""
     token: str
-    new_password: str = Field(..., min_length=8, max_length=100)
-    
-    @field_validator('new_password')
-    @classmethod
-    def password_strength(cls, v: str) -> str:
-        """Validate password strength."""
-        if not re.search(r'[A-Z]', v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        if not re.search(r'[a-z]', v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        if not re.search(r'\d', v):
-            raise ValueError('Password must contain at least one digit')
-        return v
+    new_password: StrongPassword
 
 
 class PasswordChange(BaseModel):
     """Schema for password change (logged in user)."""
     current_password: str
-    new_password: str = Field(..., min_length=8, max_length=100)
-    
-    @field_validator('new_password')
-    @classmethod
-    def password_strength(cls, v: str) -> str:
-        """Validate password strength."""
-        if not re.search(r'[A-Z]', v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        if not re.search(r'[a-z]', v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        if not re.search(r'\d', v):
-            raise ValueError('Password must contain at least one digit')
-        return v
+    new_password: StrongPassword
 
 
 class UserResponse(BaseModel):
     """Schema for user response."""
-    id: str
+    id: UUID  # the model's primary key as-is; rendered as a string in JSON
     email: str
     full_name: Optional[str]
     job_title: Optional[str]
@@ -102,8 +99,7 @@ class UserResponse(BaseModel):
     created_at: datetime
     last_login_at: Optional[datetime]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class UserUpdate(BaseModel):
@@ -4,14 +4,16 @@ FinSight AI - Demo Access Schemas
 Pydantic models for demo access request/response validation.
 """
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 
+from app.schemas.fields import Email
+
 
 class DemoAccessRequest(BaseModel):
     """Schema for requesting demo access (email-gated)."""
-    email: EmailStr
+    email: Email
     full_name: Optional[str] = Field(None, max_length=255)
     company_name: Optional[str] = Field(None, max_length=255)
     job_title: Optional[str] = Field(None, max_length=255)
@@ -31,6 +33,8 @@ class DemoAccessRequest(BaseModel):
 
 class DemoAccessResponse(BaseModel):
     """Schema for demo access response."""
+    model_config = ConfigDict(frozen=True)
+    
     success: bool
     message: str
     access_token: str  # Token to access demo
@@ -45,6 +49,8 @@ class DemoVerifyRequest(BaseModel):
 
 class DemoVerifyResponse(BaseModel):
     """Schema for demo verification response."""
+    model_config = ConfigDict(frozen=True)
+    
     valid: bool
     email: Optional[str]
     demo_url: Optional[str]
@@ -53,7 +59,7 @@ class DemoVerifyResponse(BaseModel):
 
 class ContactInquiryRequest(BaseModel):
     """Schema for contact form submission."""
-    email: EmailStr
+    email: Email
     full_name: str = Field(..., min_length=2, max_length=255)
     company_name: Optional[str] = Field(None, max_length=255)
     phone: Optional[str] = Field(None, max_length=50)
@@ -64,6 +70,8 @@ class ContactInquiryRequest(BaseModel):
 
 class ContactInquiryResponse(BaseModel):
     """Schema for contact form response."""
+    model_config = ConfigDict(frozen=True)
+    
     success: bool
     message: str
     inquiry_id: str
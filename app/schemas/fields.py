@@ -0,0 +1,34 @@
+"""
+FinSight AI - Shared Schema Fields
+==================================
+Annotated field types reused across the request/response schemas.
+"""
+
+from pydantic import AfterValidator, WithJsonSchema
+from typing import Annotated
+import re
+
+
+# Deliberately loose: one @, no whitespace, a dot in the domain. Whether the
+# address really works is proven by the verification/reset emails.
+_EMAIL_RE = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+
+# RFC 5321 limit on a forward path
+_EMAIL_MAX_LENGTH = 254
+
+
+def _validate_email(v: str) -> str:
+    """Check the shape of an email address and lowercase its domain."""
+    if len(v) > _EMAIL_MAX_LENGTH or not _EMAIL_RE.fullmatch(v):
+        raise ValueError('value is not a valid email address')
+    # Local parts are case-sensitive and stored as given (as EmailStr did)
+    local, _, domain = v.rpartition('@')
+    return f"{local}@{domain.lower()}"
+
+
+# Drop-in for pydantic's EmailStr without the email-validator dependency
+Email = Annotated[
+    str,
+    AfterValidator(_validate_email),
+    WithJsonSchema({"type": "string", "format": "email"}),
+]
@@ -4,12 +4,18 @@ FinSight AI - Organisation Schemas
 Pydantic models for organisation request/response validation.
 """
 
-from pydantic import BaseModel, EmailStr, Field, field_validator
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Optional, List, Literal
 from datetime import datetime
 from enum import Enum
+from types import MappingProxyType
 import re
 
+from app.schemas.fields import Email
+
+
+_SLUG_RE = re.compile(r'^[a-z0-9-]+$')
+
 
 class SubscriptionTierEnum(str, Enum):
     """Subscription tier levels."""
@@ -36,6 +42,11 @@ class MemberRoleEnum(str, Enum):
     VIEWER = "viewer"
 
 
+# Role as a request/response field type: a Literal validates as a plain
+# string set check; MemberRoleEnum stays for application code
+MemberRoleField = Literal["owner", "admin", "member", "viewer"]
+
+
 class OrganisationCreate(BaseModel):
     """Schema for creating an organisation."""
     name: str = Field(..., min_length=2, max_length=255)
@@ -43,7 +54,7 @@ class OrganisationCreate(BaseModel):
     industry: Optional[str] = Field(None, max_length=100)
     size: Optional[str] = Field(None, max_length=50)
     website: Optional[str] = Field(None, max_length=255)
-    billing_email: Optional[EmailStr] = None
+    billing_email: Optional[Email] = None
     
     @field_validator('slug')
     @classmethod
@@ -51,7 +62,7 @@ class OrganisationCreate(BaseModel):
         """Validate slug format."""
         if v is None:
             return v
-        if not re.match(r'^[a-z0-9-]+$', v):
+        if not _SLUG_RE.match(v):
             raise ValueError('Slug must contain only lowercase letters, numbers, and hyphens')
         return v
 
@@ -62,7 +73,7 @@ class OrganisationUpdate(BaseModel):
     industry: Optional[str] = Field(None, max_length=100)
     size: Optional[str] = Field(None, max_length=50)
     website: Optional[str] = Field(None, max_length=255)
-    billing_email: Optional[EmailStr] = None
+    billing_email: Optional[Email] = None
     billing_address: Optional[str] = None
 
 
@@ -79,8 +90,7 @@ class OrganisationResponse(BaseModel):
     trial_ends_at: Optional[datetime]
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class OrganisationDetailResponse(OrganisationResponse):
@@ -92,8 +102,8 @@ class OrganisationDetailResponse(OrganisationResponse):
 
 class MemberInvite(BaseModel):
     """Schema for inviting a member to an organisation."""
-    email: EmailStr
-    role: MemberRoleEnum = MemberRoleEnum.MEMBER
+    email: Email
+    role: MemberRoleField = MemberRoleEnum.MEMBER.value
 
 
 class MemberResponse(BaseModel):
@@ -102,60 +112,73 @@ class MemberResponse(BaseModel):
     user_id: str
     email: str
     full_name: Optional[str]
-    role: str
+    role: MemberRoleField
     joined_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class MemberRoleUpdate(BaseModel):
     """Schema for updating a member's role."""
-    role: MemberRoleEnum
+    role: MemberRoleField
+
+
+class SubscriptionLimits(BaseModel):
+    """Usage limits for a subscription tier (-1 means unlimited)."""
+    model_config = ConfigDict(frozen=True)
+    
+    users: int
+    data_sources: int
+    dashboards: int
+    records: int
 
 
 class SubscriptionInfo(BaseModel):
     """Schema for subscription information."""
+    model_config = ConfigDict(frozen=True)
+    
     tier: SubscriptionTierEnum
     status: SubscriptionStatusEnum
     trial_ends_at: Optional[datetime]
     features: List[str]
-    limits: dict
+    limits: SubscriptionLimits
 
 
 # Feature definitions per tier
-TIER_FEATURES = {
-    SubscriptionTierEnum.TRIAL: {
-        "features": [
+# Read-only at runtime: features are tuples, limits are frozen models and
+# the mappings are proxies, so a shared entry can't be mutated by a handler
+TIER_FEATURES = MappingProxyType({
+    SubscriptionTierEnum.TRIAL: MappingProxyType({
+        "features": (
             "Basic Budget vs Actual Dashboard",
             "CSV Upload (single file)",
             "7-day access",
-        ],
-        "limits": {
-            "users": 1,
-            "data_sources": 1,
-            "dashboards": 1,
-            "records": 1000,
-        }
-    },
-    SubscriptionTierEnum.ESSENTIALS: {
-        "features": [
+        ),
+        "limits": SubscriptionLimits(
+            users=1,
+            data_sources=1,
+            dashboards=1,
+            records=1000,
+        ),
+    }),
+    SubscriptionTierEnum.ESSENTIALS: MappingProxyType({
+        "features": (
             "3-5 Core Dashboards",
             "Monthly Data Refresh",
             "CSV Upload",
             "1 ERP Integration",
             "Email Support (48hr)",
             "Streamlit Dashboards",
-        ],
-        "limits": {
-            "users": 3,
-            "data_sources": 2,
-            "dashboards": 5,
-            "records": 50000,
-        }
-    },
-    SubscriptionTierEnum.PROFESSIONAL: {
-        "features": [
+        ),
+        "limits": SubscriptionLimits(
+            users=3,
+            data_sources=2,
+            dashboards=5,
+            records=50000,
+        ),
+    }),
+    SubscriptionTierEnum.PROFESSIONAL: MappingProxyType({
+        "features": (
             "8-12 Advanced Dashboards",
             "Weekly Data Refresh",
             "Up to 3 Integrations",
@@ -164,16 +187,16 @@ TIER_FEATURES = {
             "Tableau Dashboards",
             "Monthly Strategy Call",
             "Priority Email Support",
-        ],
-        "limits": {
-            "users": 10,
-            "data_sources": 5,
-            "dashboards": 15,
-            "records": 250000,
-        }
-    },
-    SubscriptionTierEnum.ENTERPRISE: {
-        "features": [
+        ),
+        "limits": SubscriptionLimits(
+            users=10,
+            data_sources=5,
+            dashboards=15,
+            records=250000,
+        ),
+    }),
+    SubscriptionTierEnum.ENTERPRISE: MappingProxyType({
+        "features": (
             "Unlimited Dashboards",
             "Real-time/Daily Refresh",
             "Unlimited Integrations",
@@ -183,12 +206,12 @@ TIER_FEATURES = {
             "Dedicated CSM",
             "Bi-weekly Strategy Calls",
             "White-glove Onboarding",
-        ],
-        "limits": {
-            "users": -1,  # Unlimited
-            "data_sources": -1,
-            "dashboards": -1,
-            "records": -1,
-        }
-    }
-}
+        ),
+        "limits": SubscriptionLimits(
+            users=-1,  # Unlimited
+            data_sources=-1,
+            dashboards=-1,
+            records=-1,
+        ),
+    }),
+})
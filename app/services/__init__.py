@@ -0,0 +1,17 @@
+"""
+FinSight AI - Services
+======================
+Business logic shared by routers and background jobs.
+"""
+
+from app.services.financial_records import insert_financial_records
+from app.services.last_login import record_login, flush_last_logins
+from app.services.demo_views import queue_demo_view, flush_demo_views
+
+__all__ = [
+    "insert_financial_records",
+    "record_login",
+    "flush_last_logins",
+    "queue_demo_view",
+    "flush_demo_views",
+]
@@ -0,0 +1,80 @@
+"""
+FinSight AI - Demo View Counting
+================================
+Buffers demo views answered from the token cache and adds them to
+demo_access in batches, instead of one UPDATE and commit per view.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+
+from sqlalchemy import update, case, func
+
+from app.core.database import AsyncSessionLocal
+from app.models.demo import DemoAccess
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds between background flushes
+FLUSH_INTERVAL_SECONDS = 30
+
+# demo_access id -> (views not yet written, time of the first of them)
+_pending: dict[uuid.UUID, tuple[int, datetime]] = {}
+
+
+def queue_demo_view(demo_access_id: uuid.UUID, viewed_at: datetime) -> None:
+    """Count one view at the next flush."""
+    views, first_viewed_at = _pending.get(demo_access_id, (0, viewed_at))
+    _pending[demo_access_id] = (views + 1, first_viewed_at)
+
+
+async def flush_demo_views() -> int:
+    """
+    Add all queued views in one UPDATE and return how many rows it covered.
+    On failure the batch is merged back into the queue and the error raised.
+    """
+    if not _pending:
+        return 0
+
+    batch = dict(_pending)
+    _pending.clear()
+
+    views = {demo_access_id: count for demo_access_id, (count, _) in batch.items()}
+    first_viewed = {demo_access_id: at for demo_access_id, (_, at) in batch.items()}
+
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(DemoAccess)
+                .where(DemoAccess.id.in_(batch))
+                .values(
+                    demo_viewed=True,
+                    demo_viewed_at=func.coalesce(
+                        DemoAccess.demo_viewed_at,
+                        case(first_viewed, value=DemoAccess.id),
+                    ),
+                    demo_view_count=DemoAccess.demo_view_count + case(views, value=DemoAccess.id),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+    except Exception:
+        for demo_access_id, (count, viewed_at) in batch.items():
+            queued, _ = _pending.get(demo_access_id, (0, None))
+            _pending[demo_access_id] = (count + queued, viewed_at)
+        raise
+
+    return len(batch)
+
+
+async def flush_demo_views_periodically() -> None:
+    """Background loop started from the app lifespan; cancel it to stop."""
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+        try:
+            await flush_demo_views()
+        except Exception as e:
+            logger.warning(f"⚠ Could not write demo view counts: {str(e)}")
@@ -0,0 +1,40 @@
+"""
+FinSight AI - Financial Record Import
+=====================================
+Bulk loading of standardised financial records (CSV and ERP imports).
+"""
+
+from typing import Iterable
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.data_source import FinancialRecord
+
+
+# Rows per multi-row INSERT statement
+BATCH_SIZE = 1000
+
+
+async def insert_financial_records(
+    db: AsyncSession,
+    rows: Iterable[dict],
+) -> int:
+    """
+    Insert financial records in bulk and return how many were written.
+    
+    Each row is a dict keyed by FinancialRecord column name. Rows go out as
+    batched multi-row INSERTs instead of one ORM object per record; no
+    instances are created, so nothing is added to the session identity map.
+    Python-side defaults (id, currency, exchange_rate) are still applied and
+    timestamps come from the database. The caller commits.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    
+    await db.execute(
+        insert(FinancialRecord).execution_options(insertmanyvalues_page_size=BATCH_SIZE),
+        rows,
+    )
+    return len(rows)
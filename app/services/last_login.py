@@ -0,0 +1,69 @@
+"""
+FinSight AI - Last Login Tracking
+=================================
+Buffers users' last-login timestamps in memory and writes them in batches,
+keeping the UPDATE and its commit off the login request path.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+
+from sqlalchemy import update, case
+
+from app.core.database import AsyncSessionLocal
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds between background flushes
+FLUSH_INTERVAL_SECONDS = 30
+
+# user_id -> most recent login time not yet written (per worker)
+_pending: dict[uuid.UUID, datetime] = {}
+
+
+def record_login(user_id: uuid.UUID, logged_in_at: datetime) -> None:
+    """Queue a last_login_at update for the next flush."""
+    _pending[user_id] = logged_in_at
+
+
+async def flush_last_logins() -> int:
+    """
+    Write all queued login times in one UPDATE and return how many users it
+    covered. On failure the batch is re-queued (newer logins win) and the
+    error is raised.
+    """
+    if not _pending:
+        return 0
+    
+    batch = dict(_pending)
+    _pending.clear()
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(User)
+                .where(User.id.in_(batch))
+                .values(last_login_at=case(batch, value=User.id))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+    except Exception:
+        for user_id, logged_in_at in batch.items():
+            _pending.setdefault(user_id, logged_in_at)
+        raise
+    
+    return len(batch)
+
+
+async def flush_last_logins_periodically() -> None:
+    """Background loop started from the app lifespan; cancel it to stop."""
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+        try:
+            await flush_last_logins()
+        except Exception as e:
+            logger.warning(f"⚠ Could not write last login times: {str(e)}")
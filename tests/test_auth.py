@@ -0,0 +1,47 @@
+"""
+Tests for registration.
+"""
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.core.security import get_password_hash_async
+from app.models import Organisation, User
+from app.routers import auth
+from app.schemas.auth import UserRegister
+
+
+def registration(email: str, company_name: str = "Acme Ltd") -> UserRegister:
+    return UserRegister(
+        email=email,
+        password="Str0ng-Passw0rd",
+        full_name="Test User",
+        company_name=company_name,
+    )
+
+
+@pytest.mark.asyncio
+async def test_duplicate_organisation_name_gets_suffixed_slug(db):
+    await auth.register(registration("first@example.com"), db)
+    await auth.register(registration("second@example.com"), db)
+    
+    slugs = await db.scalars(select(Organisation.slug).order_by(Organisation.slug))
+    assert slugs.all() == ["acme-ltd", "acme-ltd-2"]
+
+
+@pytest.mark.asyncio
+async def test_email_taken_during_registration_is_rejected(db, session_factory, monkeypatch):
+    async def hash_while_another_request_registers(password):
+        # The same email is committed between the existence check and the insert
+        async with session_factory() as other:
+            other.add(User(email="race@example.com", hashed_password="x" * 60))
+            await other.commit()
+        return await get_password_hash_async(password)
+    
+    monkeypatch.setattr(auth, "get_password_hash_async", hash_while_another_request_registers)
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await auth.register(registration("race@example.com"), db)
+    
+    assert exc_info.value.status_code == 400
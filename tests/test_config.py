@@ -0,0 +1,34 @@
+"""
+Tests for settings loading.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_importing_config_does_not_load_settings():
+    # Fresh interpreter with none of the required variables: a settings
+    # build on the import path would log the configuration error and exit
+    env = {
+        key: value for key, value in os.environ.items()
+        if key not in ("DATABASE_URL", "SECRET_KEY")
+    }
+    code = (
+        "import app.core, app.core.config as config; "
+        "assert 'settings' not in vars(config); "
+        "assert config.get_settings.cache_info().currsize == 0"
+    )
+    
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    
+    assert result.returncode == 0, result.stderr
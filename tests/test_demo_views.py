@@ -0,0 +1,98 @@
+"""
+Tests for the batched demo view counts.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app import main
+from app.models import DemoAccess
+from app.services import demo_views
+
+
+@pytest.fixture(autouse=True)
+def use_test_database(session_factory, monkeypatch):
+    monkeypatch.setattr(demo_views, "AsyncSessionLocal", session_factory)
+    monkeypatch.setattr(demo_views, "_pending", {})
+
+
+async def create_demo_access(db, email="viewer@example.com", **values) -> DemoAccess:
+    demo_access = DemoAccess(email=email, access_token=f"token-{email}", **values)
+    db.add(demo_access)
+    await db.commit()
+    return demo_access
+
+
+async def view_stats(db, demo_access: DemoAccess):
+    result = await db.execute(
+        select(DemoAccess.demo_viewed, DemoAccess.demo_view_count, DemoAccess.demo_viewed_at)
+        .where(DemoAccess.id == demo_access.id)
+    )
+    return result.one()
+
+
+@pytest.mark.asyncio
+async def test_flush_adds_queued_views(db):
+    first_view = datetime(2026, 10, 1, 9, 0, tzinfo=timezone.utc)
+    fresh = await create_demo_access(db, "fresh@example.com")
+    returning = await create_demo_access(
+        db, "returning@example.com", demo_viewed=True, demo_view_count=3, demo_viewed_at=first_view
+    )
+    now = datetime(2026, 10, 2, 9, 0, tzinfo=timezone.utc)
+    
+    demo_views.queue_demo_view(fresh.id, now)
+    demo_views.queue_demo_view(fresh.id, now)
+    demo_views.queue_demo_view(returning.id, now)
+    
+    assert await demo_views.flush_demo_views() == 2
+    assert demo_views._pending == {}
+    
+    viewed, count, viewed_at = await view_stats(db, fresh)
+    assert (viewed, count) == (True, 2)
+    assert viewed_at.replace(tzinfo=timezone.utc) == now
+    
+    viewed, count, viewed_at = await view_stats(db, returning)
+    assert (viewed, count) == (True, 4)
+    # The first view time is kept
+    assert viewed_at.replace(tzinfo=timezone.utc) == first_view
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_requeues_views(db, monkeypatch):
+    demo_access = await create_demo_access(db)
+    now = datetime(2026, 10, 2, 9, 0, tzinfo=timezone.utc)
+    demo_views.queue_demo_view(demo_access.id, now)
+    demo_views.queue_demo_view(demo_access.id, now)
+    
+    def unavailable():
+        # A view arrives while the write is in flight, then the write fails
+        demo_views.queue_demo_view(demo_access.id, now)
+        raise ConnectionError("database unavailable")
+    
+    monkeypatch.setattr(demo_views, "AsyncSessionLocal", unavailable)
+    
+    with pytest.raises(ConnectionError):
+        await demo_views.flush_demo_views()
+    
+    # Nothing lost: the failed batch is merged with the view queued since
+    assert demo_views._pending == {demo_access.id: (3, now)}
+
+
+@pytest.mark.asyncio
+async def test_shutdown_flushes_pending_views(db, monkeypatch):
+    demo_access = await create_demo_access(db)
+    now = datetime(2026, 10, 2, 9, 0, tzinfo=timezone.utc)
+    
+    async def no_warm_up():
+        pass
+    
+    monkeypatch.setattr(main, "warm_up_pool", no_warm_up)
+    
+    async with main.lifespan(main.app):
+        demo_views.queue_demo_view(demo_access.id, now)
+    
+    assert demo_views._pending == {}
+    viewed, count, _ = await view_stats(db, demo_access)
+    assert (viewed, count) == (True, 1)
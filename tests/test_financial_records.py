@@ -0,0 +1,53 @@
+"""
+Tests for bulk financial record loading.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import DataSource, DataSourceType, FinancialRecord, Organisation
+from app.services import financial_records
+from app.services.financial_records import insert_financial_records
+
+
+@pytest.mark.asyncio
+async def test_insert_spans_several_batches(db, monkeypatch):
+    monkeypatch.setattr(financial_records, "BATCH_SIZE", 100)
+    org = Organisation(name="Ledger Ltd", slug="ledger")
+    db.add(org)
+    await db.flush()
+    source = DataSource(organisation_id=org.id, name="Upload", source_type=DataSourceType.CSV)
+    db.add(source)
+    await db.flush()
+    
+    rows = [
+        {
+            "data_source_id": source.id,
+            "organisation_id": org.id,
+            "record_type": "journal",
+            "record_date": datetime(2026, 1 + i % 12, 1),
+            "period_year": 2026,
+            "period_month": 1 + i % 12,
+            "account_code": f"4{i % 10:03d}",
+            "amount_actual": Decimal("10.50"),
+        }
+        for i in range(250)
+    ]
+    
+    written = await insert_financial_records(db, rows)
+    await db.commit()
+    
+    assert written == 250
+    assert await db.scalar(select(func.count()).select_from(FinancialRecord)) == 250
+    # Python-side defaults still applied; no ORM instances were created
+    assert await db.scalar(select(func.count(func.distinct(FinancialRecord.id)))) == 250
+    assert await db.scalar(select(func.min(FinancialRecord.currency))) == "GBP"
+    assert not any(isinstance(obj, FinancialRecord) for obj in db.identity_map.values())
+
+
+@pytest.mark.asyncio
+async def test_insert_nothing(db):
+    assert await insert_financial_records(db, []) == 0
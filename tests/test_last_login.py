@@ -0,0 +1,87 @@
+"""
+Tests for the batched last_login_at writes.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app import main
+from app.models import User
+from app.services import last_login
+
+
+@pytest.fixture(autouse=True)
+def use_test_database(session_factory, monkeypatch):
+    monkeypatch.setattr(last_login, "AsyncSessionLocal", session_factory)
+    monkeypatch.setattr(last_login, "_pending", {})
+
+
+async def create_user(db, email="login@example.com") -> User:
+    user = User(email=email, hashed_password="x" * 60)
+    db.add(user)
+    await db.commit()
+    return user
+
+
+async def last_login_at(db, user: User) -> datetime:
+    value = await db.scalar(select(User.last_login_at).where(User.id == user.id))
+    # SQLite hands back naive datetimes
+    return value.replace(tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_queued_logins(db):
+    first = await create_user(db, "first@example.com")
+    second = await create_user(db, "second@example.com")
+    earlier = datetime(2026, 10, 1, 9, 0, tzinfo=timezone.utc)
+    later = datetime(2026, 10, 1, 9, 5, tzinfo=timezone.utc)
+    
+    last_login.record_login(first.id, earlier)
+    last_login.record_login(first.id, later)
+    last_login.record_login(second.id, earlier)
+    
+    assert await last_login.flush_last_logins() == 2
+    assert last_login._pending == {}
+    
+    assert await last_login_at(db, first) == later
+    assert await last_login_at(db, second) == earlier
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_requeues_logins(db, monkeypatch):
+    user = await create_user(db)
+    queued_at = datetime(2026, 10, 1, 9, 0, tzinfo=timezone.utc)
+    newer = datetime(2026, 10, 1, 9, 5, tzinfo=timezone.utc)
+    last_login.record_login(user.id, queued_at)
+    
+    def unavailable():
+        # A login arrives while the write is in flight, then the write fails
+        last_login.record_login(user.id, newer)
+        raise ConnectionError("database unavailable")
+    
+    monkeypatch.setattr(last_login, "AsyncSessionLocal", unavailable)
+    
+    with pytest.raises(ConnectionError):
+        await last_login.flush_last_logins()
+    
+    # Re-queued, and the newer login wins
+    assert last_login._pending == {user.id: newer}
+
+
+@pytest.mark.asyncio
+async def test_shutdown_flushes_pending_logins(db, monkeypatch):
+    user = await create_user(db)
+    logged_in_at = datetime(2026, 10, 1, 9, 0, tzinfo=timezone.utc)
+    
+    async def no_warm_up():
+        pass
+    
+    monkeypatch.setattr(main, "warm_up_pool", no_warm_up)
+    
+    async with main.lifespan(main.app):
+        last_login.record_login(user.id, logged_in_at)
+    
+    assert last_login._pending == {}
+    assert await last_login_at(db, user) == logged_in_at
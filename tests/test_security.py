@@ -0,0 +1,77 @@
+"""
+Tests for token handling and the current-user dependencies.
+"""
+
+from datetime import timedelta
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.security import (
+    create_access_token,
+    decode_token,
+    get_current_user_profile,
+    user_token_claims,
+)
+from app.models import User
+
+
+def bearer(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.mark.asyncio
+async def test_profile_served_from_claims(db):
+    user = User(email="claims@example.com", hashed_password="x" * 60, full_name="Claims User")
+    db.add(user)
+    await db.commit()
+    token = create_access_token(user_token_claims(user))
+    await db.delete(user)
+    await db.commit()
+    
+    # No row left to read: the profile can only have come from the claims
+    profile = await get_current_user_profile(bearer(token), db)
+    
+    assert profile.email == "claims@example.com"
+    assert profile.is_active is True
+
+
+@pytest.mark.asyncio
+async def test_profile_rejects_deactivated_user(db):
+    user = User(email="gone@example.com", hashed_password="x" * 60, is_active=False)
+    db.add(user)
+    await db.commit()
+    token = create_access_token(user_token_claims(user))
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user_profile(bearer(token), db)
+    
+    assert exc_info.value.status_code == 403
+
+
+def test_expired_token_rejected_on_cache_hit():
+    token = create_access_token({"sub": "expiring"}, expires_delta=timedelta(seconds=1))
+    decode_token(token)  # verified and cached
+    
+    # Past "exp": the cached payload must not be returned
+    time.sleep(2)
+    
+    with pytest.raises(HTTPException) as exc_info:
+        decode_token(token)
+    
+    assert exc_info.value.status_code == 401
+
+
+def test_tampered_token_does_not_hit_cache():
+    token = create_access_token({"sub": "original"})
+    decode_token(token)
+    
+    header, body, signature = token.split(".")
+    tampered = ".".join((header, body, signature[:-2] + ("AA" if signature[-2:] != "AA" else "BB")))
+    
+    with pytest.raises(HTTPException) as exc_info:
+        decode_token(tampered)
+    
+    assert exc_info.value.status_code == 401
@@ -0,0 +1,137 @@
+"""
+Tests for applying recorded Stripe webhook events.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.models import StripeEvent
+from app.routers import subscriptions
+
+
+@pytest.fixture(autouse=True)
+def use_test_database(session_factory, monkeypatch):
+    monkeypatch.setattr(subscriptions, "AsyncSessionLocal", session_factory)
+
+
+@pytest.fixture
+def applied(monkeypatch):
+    """Record subscription updates instead of touching organisations."""
+    calls = []
+    
+    async def handle_subscription_updated(subscription, db):
+        calls.append(subscription["id"])
+    
+    monkeypatch.setattr(subscriptions, "handle_subscription_updated", handle_subscription_updated)
+    return calls
+
+
+def subscription_updated(event_id: str, created: int, subscription_id: str = "sub_1") -> dict:
+    return {
+        "id": event_id,
+        "type": "customer.subscription.updated",
+        "created": created,
+        "data": {"object": {"id": subscription_id, "status": "active"}},
+    }
+
+
+async def record(db, event: dict, **values) -> None:
+    db.add(StripeEvent(
+        event_id=event["id"],
+        type=event["type"],
+        payload=event,
+        subscription_id=subscriptions._event_subscription_id(event),
+        event_created_at=subscriptions._event_created_at(event),
+        **values,
+    ))
+    await db.commit()
+
+
+async def stored(db, event_id: str) -> StripeEvent:
+    return await db.scalar(
+        select(StripeEvent)
+        .where(StripeEvent.event_id == event_id)
+        .execution_options(populate_existing=True)
+    )
+
+
+@pytest.mark.asyncio
+async def test_event_is_applied_and_marked_processed(db, applied):
+    event = subscription_updated("evt_1", created=1_760_000_000)
+    await record(db, event)
+    
+    await subscriptions.process_stripe_event(event)
+    
+    assert applied == ["sub_1"]
+    row = await stored(db, "evt_1")
+    assert row.processed_at is not None
+    assert row.attempts == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_event_records_attempt_and_error(db, monkeypatch):
+    async def failing(subscription, db):
+        raise RuntimeError("organisation lookup failed")
+    
+    monkeypatch.setattr(subscriptions, "handle_subscription_updated", failing)
+    event = subscription_updated("evt_fail", created=1_760_000_000)
+    await record(db, event)
+    
+    await subscriptions.process_stripe_event(event)
+    await subscriptions.process_stripe_event(event)
+    
+    row = await stored(db, "evt_fail")
+    assert row.processed_at is None
+    assert row.attempts == 2
+    assert row.last_error == "organisation lookup failed"
+
+
+@pytest.mark.asyncio
+async def test_older_event_does_not_overwrite_newer_one(db, applied):
+    older = subscription_updated("evt_old", created=1_760_000_000)
+    newer = subscription_updated("evt_new", created=1_760_000_060)
+    await record(db, older)
+    await record(db, newer)
+    
+    await subscriptions.process_stripe_event(newer)
+    await subscriptions.process_stripe_event(older)
+    
+    # Only the newer update was applied; the older one is closed off
+    assert applied == ["sub_1"]
+    assert (await stored(db, "evt_old")).processed_at is not None
+
+
+@pytest.mark.asyncio
+async def test_event_being_applied_is_not_applied_again(db, applied):
+    event = subscription_updated("evt_busy", created=1_760_000_000)
+    # Another delivery's task claimed it a moment ago
+    await record(db, event, processing_started_at=datetime.now(timezone.utc))
+    
+    await subscriptions.process_stripe_event(event)
+    
+    assert applied == []
+    assert (await stored(db, "evt_busy")).processed_at is None
+
+
+@pytest.mark.asyncio
+async def test_abandoned_claim_is_taken_over(db, applied):
+    event = subscription_updated("evt_stuck", created=1_760_000_000)
+    abandoned_at = datetime.now(timezone.utc) - subscriptions.STRIPE_EVENT_CLAIM_TIMEOUT - timedelta(minutes=1)
+    await record(db, event, processing_started_at=abandoned_at)
+    
+    await subscriptions.process_stripe_event(event)
+    
+    assert applied == ["sub_1"]
+    assert (await stored(db, "evt_stuck")).processed_at is not None
+
+
+@pytest.mark.asyncio
+async def test_event_out_of_attempts_is_not_applied(db, applied):
+    event = subscription_updated("evt_dead", created=1_760_000_000)
+    await record(db, event, attempts=subscriptions.STRIPE_EVENT_MAX_ATTEMPTS)
+    
+    await subscriptions.process_stripe_event(event)
+    
+    assert applied == []
@@ -0,0 +1,73 @@
+"""
+Tests for the subscription endpoints' membership loading.
+
+The checkout and portal handlers load the caller's membership with the
+organisation joined and raiseload("*") on everything else; these run them
+against a real session so a new lazy load fails here instead of in production.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+import stripe
+from fastapi import HTTPException
+
+from app.routers import subscriptions
+
+
+@pytest.mark.asyncio
+async def test_checkout_creates_customer_and_session(db, org_member, monkeypatch):
+    user = await org_member("owner")
+    calls = {}
+    
+    def create_customer(**kwargs):
+        calls["customer"] = kwargs
+        return SimpleNamespace(id="cus_test")
+    
+    def create_session(**kwargs):
+        calls["session"] = kwargs
+        return SimpleNamespace(id="cs_test", url="https://checkout.stripe.test/cs_test")
+    
+    monkeypatch.setattr(stripe.Customer, "create", create_customer)
+    monkeypatch.setattr(stripe.checkout.Session, "create", create_session)
+    
+    result = await subscriptions.create_checkout_session("essentials", current_user=user, db=db)
+    
+    assert result == {"checkout_url": "https://checkout.stripe.test/cs_test", "session_id": "cs_test"}
+    assert calls["customer"]["name"] == "Test Ltd"
+    assert calls["session"]["customer"] == "cus_test"
+    assert calls["session"]["metadata"]["tier"] == "essentials"
+
+
+@pytest.mark.asyncio
+async def test_checkout_requires_owner_or_admin(db, org_member):
+    user = await org_member("member")
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await subscriptions.create_checkout_session("essentials", current_user=user, db=db)
+    
+    assert exc_info.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_portal_returns_session_url(db, org_member, monkeypatch):
+    user = await org_member("admin", stripe_customer_id="cus_portal")
+    monkeypatch.setattr(
+        stripe.billing_portal.Session,
+        "create",
+        lambda **kwargs: SimpleNamespace(url=f"https://billing.stripe.test/{kwargs['customer']}"),
+    )
+    
+    result = await subscriptions.create_portal_session(current_user=user, db=db)
+    
+    assert result == {"portal_url": "https://billing.stripe.test/cus_portal"}
+
+
+@pytest.mark.asyncio
+async def test_portal_without_customer_is_rejected(db, org_member):
+    user = await org_member("owner")
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await subscriptions.create_portal_session(current_user=user, db=db)
+    
+    assert exc_info.value.status_code == 400